@@ -6,26 +6,32 @@ gamer-flavoured newsletter to Discord with a YouTube video link.
 All feed/filter/fetch logic lives in shared.py.
 """
 
+import concurrent.futures
+import hashlib
+import itertools
 import json
 import os
-import re
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-import requests
+import orjson
 
 from shared import (
     FEEDS,
+    SESSION,
     Item,
     compute_score,
     fetch_all_feeds,
+    first_long_form,
     getenv,
     post_webhook,
     shorten,
     topic_similarity,
     utcnow,
+    write_text_atomic,
+    youtube_feed_candidates,
 )
 
 # ---------------------------------------------------------------------------
@@ -37,6 +43,8 @@ DIGEST_TOP_N        = int(getenv("DIGEST_TOP_N", "5"))
 DIGEST_MAX_PER_SOURCE = int(getenv("DIGEST_MAX_PER_SOURCE", "2"))
 DIGEST_WINDOW_HOURS = int(getenv("DIGEST_WINDOW_HOURS", "24"))
 DIGEST_CACHE_FILE   = getenv("DIGEST_CACHE_FILE", ".digest_cache.json")
+# Parsed feed items, kept out of the committed cache (runner-cached instead)
+DIGEST_FEED_ITEMS_FILE = getenv("DIGEST_FEED_ITEMS_FILE", ".digest_feed_items.json")
 DIGEST_FORCE_POST   = getenv("DIGEST_FORCE_POST", "").lower() in ("1", "true", "yes", "y")
 DIGEST_POST_ONCE_PER_DAY = getenv("DIGEST_POST_ONCE_PER_DAY", "").lower() in ("1", "true", "yes", "y")
 
@@ -44,6 +52,8 @@ DIGEST_GUARD_TZ      = getenv("DIGEST_GUARD_TZ", "America/Los_Angeles")
 DIGEST_GUARD_HOUR    = int(getenv("DIGEST_GUARD_LOCAL_HOUR", "19"))
 DIGEST_GUARD_MINUTE  = int(getenv("DIGEST_GUARD_LOCAL_MINUTE", "0"))
 DIGEST_GUARD_WINDOW  = int(getenv("DIGEST_GUARD_WINDOW_MINUTES", "30"))
+LOCAL_TZ             = ZoneInfo(DIGEST_GUARD_TZ)
+EXPORT_TZ            = ZoneInfo("America/Los_Angeles")  # export/email dates are always Pacific
 
 NEWSLETTER_NAME    = getenv("NEWSLETTER_NAME", "Itty Bitty Gaming News")
 NEWSLETTER_TAGLINE = getenv("NEWSLETTER_TAGLINE", "Your snackable video game news.")
@@ -59,18 +69,44 @@ UA = getenv("USER_AGENT", "IttyBittyGamingNews/Digest")
 # CACHE
 # ---------------------------------------------------------------------------
 
+# feed_meta keys that go to DIGEST_FEED_ITEMS_FILE; the committed cache keeps
+# only the validators (etag, last_modified, body_sha1, fetched_at).
+FEED_ITEM_KEYS = ("items", "items_version", "max_age_hours")
+
+
 def load_cache() -> Dict:
     try:
-        with open(DIGEST_CACHE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(DIGEST_CACHE_FILE, "rb") as f:
+            cache = orjson.loads(f.read())
     except Exception:
         return {}
 
+    try:
+        with open(DIGEST_FEED_ITEMS_FILE, "rb") as f:
+            feed_items = orjson.loads(f.read())
+    except (OSError, ValueError):
+        feed_items = {}
+    # Rejoin items onto their validators only when both came from the same
+    # body; otherwise fetch_feed sees no items and refetches unconditionally.
+    for url, meta in cache.get("feed_meta", {}).items():
+        saved = feed_items.get(url)
+        if saved and saved.get("body_sha1") == meta.get("body_sha1"):
+            meta.update({k: saved[k] for k in FEED_ITEM_KEYS if k in saved})
+    return cache
+
 
 def save_cache(cache: Dict) -> None:
+    committed  = dict(cache)
+    feed_items = {}
+    if "feed_meta" in cache:
+        committed["feed_meta"] = {}
+        for url, meta in cache["feed_meta"].items():
+            committed["feed_meta"][url] = {k: v for k, v in meta.items() if k not in FEED_ITEM_KEYS}
+            if "items" in meta:
+                feed_items[url] = {k: meta[k] for k in ("body_sha1", *FEED_ITEM_KEYS) if k in meta}
     try:
-        with open(DIGEST_CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(cache, f, indent=2, sort_keys=True)
+        write_text_atomic(DIGEST_CACHE_FILE, orjson.dumps(committed, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode())
+        write_text_atomic(DIGEST_FEED_ITEMS_FILE, orjson.dumps(feed_items).decode())
     except Exception as e:
         print(f"[CACHE] Save failed: {e}")
 
@@ -80,7 +116,7 @@ def save_cache(cache: Dict) -> None:
 # ---------------------------------------------------------------------------
 
 def now_local() -> datetime:
-    return datetime.now(ZoneInfo(DIGEST_GUARD_TZ))
+    return datetime.now(LOCAL_TZ)
 
 
 def guard_posting_window() -> bool:
@@ -88,13 +124,14 @@ def guard_posting_window() -> bool:
         print("[GUARD] DIGEST_FORCE_POST — bypassing time guard.")
         return True
 
-    now    = now_local()
-    target = now.replace(hour=DIGEST_GUARD_HOUR, minute=DIGEST_GUARD_MINUTE, second=0, microsecond=0)
-    candidates = [target - timedelta(days=1), target, target + timedelta(days=1)]
-    closest    = min(candidates, key=lambda t: abs((now - t).total_seconds()))
-    delta_min  = abs((now - closest).total_seconds()) / 60.0
+    # Circular distance on the 24h wall clock between now and the target time
+    now        = now_local()
+    now_min    = now.hour * 60 + now.minute + (now.second + now.microsecond / 1e6) / 60.0
+    target_min = DIGEST_GUARD_HOUR * 60 + DIGEST_GUARD_MINUTE
+    diff       = (now_min - target_min) % 1440   # Python modulo is already non-negative
+    delta_min  = min(diff, 1440 - diff)
 
-    print(f"[GUARD] Now={now:%H:%M %Z} | Target={closest:%H:%M %Z} | delta={delta_min:.1f}min | window={DIGEST_GUARD_WINDOW}min")
+    print(f"[GUARD] Now={now:%H:%M %Z} | Target={DIGEST_GUARD_HOUR:02d}:{DIGEST_GUARD_MINUTE:02d} {now:%Z} | delta={delta_min:.1f}min | window={DIGEST_GUARD_WINDOW}min")
 
     if delta_min <= DIGEST_GUARD_WINDOW:
         print(f"[GUARD] Within posting window.")
@@ -140,43 +177,39 @@ def pick_top_stories(items: List[Item]) -> List[Item]:
     per_source: Dict[str, int] = {}
     seen_urls: set = set()
 
-    max_iterations = DIGEST_TOP_N * 6
-    iterations = 0
-
-    while len(picked) < DIGEST_TOP_N and iterations < max_iterations:
-        iterations += 1
-
-        recent.sort(key=lambda x: (x.score, x.published_at.timestamp()), reverse=True)
-
-        advanced = False
-        for it in recent:
-            if it.url in seen_urls:
-                continue
-
-            per_source.setdefault(it.source, 0)
-            if per_source[it.source] >= DIGEST_MAX_PER_SOURCE:
-                continue
-
-            seen_urls.add(it.url)
-            per_source[it.source] += 1
-            picked.append(it)
-
-            for other in recent:
-                if other.url in seen_urls:
-                    continue
-                sim = topic_similarity(it.title, other.title)
-                if sim >= TOPIC_SIMILARITY_THRESHOLD:
-                    penalty = TOPIC_PENALTY + int((sim - TOPIC_SIMILARITY_THRESHOLD) * 0.5)
-                    other.score -= penalty
-                    if other.score < 0:
-                        other.score = 0
-
-            advanced = True
+    # Scores change after every pick (topic penalties), so there is nothing
+    # worth sorting up front: each round is one pass taking the best eligible
+    # item. Exact (score, published) ties go to the earlier item in `items`.
+    # published_at is always tz-aware UTC, so it compares directly — no
+    # .timestamp() conversion per item per round.
+    while len(picked) < DIGEST_TOP_N:
+        it = max(
+            (it for it in recent
+             if it.url not in seen_urls and per_source.get(it.source, 0) < DIGEST_MAX_PER_SOURCE),
+            key=lambda x: (x.score, x.published_at),
+            default=None,
+        )
+        if it is None:
             break
 
-        if not advanced:
+        seen_urls.add(it.url)
+        per_source[it.source] = per_source.get(it.source, 0) + 1
+        picked.append(it)
+        if len(picked) >= DIGEST_TOP_N:
             break
 
+        # Penalise only items that can still be picked: already-picked URLs
+        # and sources at their cap are out, so skip their similarity scoring
+        for other in recent:
+            if other.url in seen_urls or per_source.get(other.source, 0) >= DIGEST_MAX_PER_SOURCE:
+                continue
+            sim = topic_similarity(it.title, other.title)
+            if sim >= TOPIC_SIMILARITY_THRESHOLD:
+                penalty = TOPIC_PENALTY + int((sim - TOPIC_SIMILARITY_THRESHOLD) * 0.5)
+                other.score -= penalty
+                if other.score < 0:
+                    other.score = 0
+
     return picked
 
 
@@ -201,7 +234,8 @@ TAG_DISPLAY = {
 }
 
 SECTION_DIVIDER = "--------------------"
-STORY_ICONS = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
+STORY_ICONS  = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
+TEASER_ICONS = ("🔥", "⚡", "🎯")  # one per header teaser line
 
 
 def _tag_badges(tags: List[str]) -> str:
@@ -213,26 +247,23 @@ def _tag_badges(tags: List[str]) -> str:
 
 
 def build_header_embed(top_stories: List[Item]) -> Dict:
-    tz    = ZoneInfo(DIGEST_GUARD_TZ)
-    today = datetime.now(tz).strftime("%A, %B %d, %Y")
-
-    teaser_lines = []
-    for i, s in enumerate(top_stories[:3]):
-        icon = ["🔥", "⚡", "🎯"][i]
-        teaser_lines.append(f"{icon} {s.title}")
-
-    desc = "\n".join([
-        f"*{NEWSLETTER_TAGLINE}*",
-        "",
-        f"**📅 {today}**",
-        "",
-        SECTION_DIVIDER,
-        "**Tonight's Headlines**",
-        SECTION_DIVIDER,
-        "\n".join(teaser_lines),
-        "",
-        "⬇️ *Full stories below*",
-    ])
+    today = now_local().strftime("%A, %B %d, %Y")
+
+    # One join over the fixed lines plus a teaser generator (zip caps it at
+    # len(TEASER_ICONS)) — no intermediate teaser list or nested join.
+    desc = "\n".join(itertools.chain(
+        (
+            f"*{NEWSLETTER_TAGLINE}*",
+            "",
+            f"**📅 {today}**",
+            "",
+            SECTION_DIVIDER,
+            "**Tonight's Headlines**",
+            SECTION_DIVIDER,
+        ),
+        (f"{icon} {s.title}" for icon, s in zip(TEASER_ICONS, top_stories)),
+        ("", "⬇️ *Full stories below*"),
+    ))
 
     return {
         "title":       f"{NEWSLETTER_EMOJI} {NEWSLETTER_NAME}",
@@ -282,8 +313,7 @@ def _rank_color(rank: int) -> int:
 
 
 def build_footer_embed(story_count: int) -> Dict:
-    tz    = ZoneInfo(DIGEST_GUARD_TZ)
-    today = datetime.now(tz).strftime("%B %d, %Y")
+    today = now_local().strftime("%B %d, %Y")
 
     desc = "\n".join([
         SECTION_DIVIDER,
@@ -306,7 +336,12 @@ def build_footer_embed(story_count: int) -> Dict:
 # YOUTUBE
 # ---------------------------------------------------------------------------
 
-def youtube_latest() -> Optional[Tuple[str, str]]:
+def youtube_latest(yt_meta: Optional[Dict] = None) -> Optional[Tuple[str, str]]:
+    """
+    Latest long-form upload as (watch_url, title). yt_meta (persisted by the
+    caller) holds the feed's ETag/Last-Modified and the last result, so an
+    unchanged feed comes back as a 304 and skips the parse and Shorts probes.
+    """
     rss = YOUTUBE_RSS_URL
     if not rss and YOUTUBE_CHANNEL_ID:
         rss = f"https://www.youtube.com/feeds/videos.xml?channel_id={YOUTUBE_CHANNEL_ID}"
@@ -324,45 +359,41 @@ def youtube_latest() -> Optional[Tuple[str, str]]:
         "Accept-Language": "en-US,en;q=0.9",
     }
 
+    cached = yt_meta.get("result") if yt_meta is not None and yt_meta.get("rss") == rss else None
+    if cached:
+        if yt_meta.get("etag"):
+            yt_headers["If-None-Match"] = yt_meta["etag"]
+        if yt_meta.get("last_modified"):
+            yt_headers["If-Modified-Since"] = yt_meta["last_modified"]
+
     last_error = None
     for attempt in range(1, 4):
         try:
             print(f"[YT] Fetching RSS (attempt {attempt}): {rss}")
-            r = requests.get(rss, headers=yt_headers, timeout=25)
+            r = SESSION.get(rss, headers=yt_headers, timeout=25)
+            if r.status_code == 304 and cached:
+                print(f"[YT] Feed not modified — reusing: {cached[1]}")
+                return (cached[0], cached[1])
             r.raise_for_status()
 
-            entries = re.findall(r"<entry\b.*?</entry>", r.text, flags=re.DOTALL)
-            if not entries:
-                print("[YT] Feed returned no entries.")
+            candidates = youtube_feed_candidates(r.text, filter_shorts=YOUTUBE_FILTER_SHORTS)
+            if not candidates:
+                print("[YT] Feed returned no long-form entries.")
                 return None
 
-            for ent in entries[:25]:
-                m_vid   = re.search(r"<yt:videoId>([^<]+)</yt:videoId>", ent)
-                m_title = re.search(r"<title>([^<]+)</title>", ent)
-                if not m_vid:
-                    continue
-                vid   = m_vid.group(1).strip()
-                title = m_title.group(1).strip() if m_title else "Latest video"
-                if YOUTUBE_FILTER_SHORTS:
-                    t = title.lower()
-                    if "#shorts" in t or " shorts" in t or t.endswith("shorts"):
-                        print(f"[YT] Skipping Short (title): {title}")
-                        continue
-                    # URL-based check — reliable Shorts detection
-                    try:
-                        sr = requests.head(
-                            f"https://www.youtube.com/shorts/{vid}",
-                            headers={"User-Agent": "Mozilla/5.0"},
-                            allow_redirects=True,
-                            timeout=8,
-                        )
-                        if "/shorts/" in sr.url:
-                            print(f"[YT] Skipping Short (URL check): {title}")
-                            continue
-                    except Exception:
-                        pass
+            found = first_long_form(candidates) if YOUTUBE_FILTER_SHORTS else candidates[0]
+            if found:
+                vid, title = found[0], found[1] or "Latest video"
                 print(f"[YT] Found latest long-form video: {title}")
-                return (f"https://www.youtube.com/watch?v={vid}", title)
+                result = (f"https://www.youtube.com/watch?v={vid}", title)
+                if yt_meta is not None:
+                    yt_meta.update({
+                        "rss":           rss,
+                        "etag":          r.headers.get("ETag", ""),
+                        "last_modified": r.headers.get("Last-Modified", ""),
+                        "result":        list(result),
+                    })
+                return result
 
         except Exception as ex:
             last_error = ex
@@ -391,9 +422,24 @@ def main() -> None:
         print("[DIGEST] Already posted today — skipping.")
         return
 
-    # --- Fetch + filter ---
+    # --- Fetch + filter (YouTube lookup overlaps the feed fetch) ---
     print("[DIGEST] Fetching feeds...")
-    all_items, reasons = fetch_all_feeds(FEEDS)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        f_feeds = executor.submit(
+            fetch_all_feeds,
+            FEEDS,
+            max_age_hours=DIGEST_WINDOW_HOURS,
+            feed_meta=cache.setdefault("feed_meta", {}),
+        )
+        f_yt    = executor.submit(youtube_latest, cache.setdefault("youtube_meta", {}))
+        all_items, reasons = f_feeds.result()
+        yt = f_yt.result()
+
+    yt_url   = yt[0] if yt else None
+    yt_title = yt[1] if yt else None
+
+    # Persist feed_meta/youtube_meta now so a retry after a later failure starts warm
+    save_cache(cache)
 
     if not all_items:
         print("[DIGEST] No items after filtering. Exiting.")
@@ -413,17 +459,8 @@ def main() -> None:
     # --- Export stories for OnlySocial ---
     export_file = getenv("DIGEST_EXPORT_FILE", "digest_latest.json")
     try:
-        # Fetch YouTube latest video so it can be included in email/social
-        yt = youtube_latest()
-        yt_url   = yt[0] if yt else None
-        yt_title = yt[1] if yt else None
-
         # Generate date in PT so email always shows the correct local date
-        try:
-            from zoneinfo import ZoneInfo as _ZI
-            post_date = datetime.now(_ZI("America/Los_Angeles")).strftime("%B %-d, %Y")
-        except Exception:
-            post_date = datetime.now().strftime("%B %-d, %Y")
+        post_date = datetime.now(EXPORT_TZ).strftime("%B %-d, %Y")
 
         export_data = {
             "should_post": True,
@@ -432,9 +469,15 @@ def main() -> None:
             "youtube_url":   yt_url,
             "youtube_title": yt_title,
         }
-        with open(export_file, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2)
-        print(f"[DIGEST] Exported {len(top)} stories to {export_file} (date: {post_date})")
+        # Content-hash gate: re-runs with the same picks leave the file untouched
+        payload       = json.dumps(export_data, indent=2)
+        export_digest = hashlib.sha256(json.dumps(export_data, sort_keys=True).encode("utf-8")).hexdigest()
+        if cache.get("last_export_digest") == export_digest and os.path.exists(export_file):
+            print(f"[DIGEST] Export unchanged — leaving {export_file} as is")
+        else:
+            write_text_atomic(export_file, payload)
+            cache["last_export_digest"] = export_digest
+            print(f"[DIGEST] Exported {len(top)} stories to {export_file} (date: {post_date})")
     except Exception as ex:
         print(f"[DIGEST] Export failed (non-fatal): {ex}")
 
@@ -6,13 +6,19 @@ via the Mailchimp API to the IBGN audience.
 """
 
 import concurrent.futures
+import html
 import json
 import os
 import re
 import sys
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from shared import first_long_form, write_text_atomic, youtube_feed_candidates
 
 # ---------------------------------------------------------------------------
 # CONFIG
@@ -29,22 +35,47 @@ PODCAST_URL         = env("PODCAST_URL", "https://podcasts.apple.com/us/podcast/
 LOGO_URL            = env("LOGO_URL", "https://raw.githubusercontent.com/rasmith2447-cell/itty-bitty-news-bot/main/Itty%20Bitty%20Gaming%20News%20Logo%20V.2.png")
 TAGLINE             = "And that's your Itty Bitty Gaming News!"
 
+# Newsletter dates are Pacific. If tzdata is missing, None makes
+# datetime.now(PACIFIC_TZ) fall back to naive local time.
+try:
+    PACIFIC_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:
+    PACIFIC_TZ = None
+
 # IGDB config
 IGDB_CLIENT_ID      = env("IGDB_CLIENT_ID")
 IGDB_CLIENT_SECRET  = env("IGDB_CLIENT_SECRET")
 IGDB_DAYS_AHEAD     = int(env("IGDB_DAYS_AHEAD", "14"))
 IGDB_PLATFORMS      = [6, 48, 167, 49, 169, 130]  # PC, PS4, PS5, XB1, XSX, Switch
+IGDB_PLATFORM_NAMES = {
+    "PC (Microsoft Windows)": "PC",
+    "Xbox Series X|S": "Xbox Series X/S",
+    "PlayStation 5": "PS5",
+    "PlayStation 4": "PS4",
+    "Nintendo Switch": "Switch",
+    "Xbox One": "Xbox One",
+}
 
 # Mailchimp datacenter is the suffix after the dash in the API key (e.g. us9)
 DC = MAILCHIMP_API_KEY.split("-")[-1] if "-" in MAILCHIMP_API_KEY else "us1"
 BASE = f"https://{DC}.api.mailchimp.com/3.0"
 
+# One pooled session for every call in the send (IGDB, Mailchimp, OG images,
+# YouTube) so repeat hosts reuse keep-alive connections. Sized for the widest
+# fan-out (8 Shorts probes); only GET/HEAD are retried, never a campaign send.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET", "HEAD")),
+))
+
 # ---------------------------------------------------------------------------
 # IGDB RELEASES
 # ---------------------------------------------------------------------------
 
 def igdb_token() -> str:
-    r = requests.post(
+    r = SESSION.post(
         "https://id.twitch.tv/oauth2/token",
         params={
             "client_id":     IGDB_CLIENT_ID,
@@ -58,7 +89,7 @@ def igdb_token() -> str:
 
 
 def igdb_query(token: str, endpoint: str, query: str) -> list:
-    r = requests.post(
+    r = SESSION.post(
         f"https://api.igdb.com/v4/{endpoint}",
         headers={
             "Client-ID":     IGDB_CLIENT_ID,
@@ -84,9 +115,10 @@ def fetch_upcoming_releases() -> list:
 
     now      = datetime.now(timezone.utc)
     start    = int(now.timestamp())
-    end      = int((now + timedelta(days=30)).timestamp())
+    until    = now + timedelta(days=30)
+    end      = int(until.timestamp())
     plats    = ",".join(str(p) for p in IGDB_PLATFORMS)
-    print(f"[IGDB] Querying releases from {now.strftime('%Y-%m-%d')} to {(now + timedelta(days=30)).strftime('%Y-%m-%d')}")
+    print(f"[IGDB] Querying releases from {now.strftime('%Y-%m-%d')} to {until.strftime('%Y-%m-%d')}")
     query    = f"""
     fields game.name, game.cover.url, date, platform.name, platform.id;
     where date >= {start}
@@ -102,14 +134,6 @@ def fetch_upcoming_releases() -> list:
         return []
 
     seen = {}
-    PLATFORM_NAMES = {
-        "PC (Microsoft Windows)": "PC",
-        "Xbox Series X|S": "Xbox Series X/S",
-        "PlayStation 5": "PS5",
-        "PlayStation 4": "PS4",
-        "Nintendo Switch": "Switch",
-        "Xbox One": "Xbox One",
-    }
     for item in results:
         game = item.get("game", {})
         if not game:
@@ -118,21 +142,20 @@ def fetch_upcoming_releases() -> list:
         if not name:
             continue
         date_ts  = item.get("date", 0)
-        platform = PLATFORM_NAMES.get(
-            item.get("platform", {}).get("name", ""),
-            item.get("platform", {}).get("name", "")
-        )
+        raw_plat = (item.get("platform") or {}).get("name", "")
+        platform = IGDB_PLATFORM_NAMES.get(raw_plat, raw_plat)
         cover    = game.get("cover", {})
         cover_url = ""
         if cover and cover.get("url"):
             cover_url = "https:" + cover["url"].replace("t_thumb", "t_cover_big")
-        if name not in seen:
+        rel = seen.get(name)
+        if rel is None:
             seen[name] = {"name": name, "date": date_ts, "platforms": [platform] if platform else [], "cover_url": cover_url}
         else:
-            if platform and platform not in seen[name]["platforms"]:
-                seen[name]["platforms"].append(platform)
-            if date_ts < seen[name]["date"]:
-                seen[name]["date"] = date_ts
+            if platform and platform not in rel["platforms"]:
+                rel["platforms"].append(platform)
+            if date_ts < rel["date"]:
+                rel["date"] = date_ts
 
     releases = sorted(seen.values(), key=lambda x: x["date"])[:8]
     for r in releases:
@@ -151,14 +174,14 @@ def headers() -> dict:
     }
 
 def mc_post(path: str, payload: dict) -> dict:
-    r = requests.post(f"{BASE}{path}", headers=headers(), json=payload, timeout=30)
+    r = SESSION.post(f"{BASE}{path}", headers=headers(), json=payload, timeout=30)
     if not r.ok:
         print(f"[MAILCHIMP] HTTP {r.status_code}: {r.text[:500]}")
         r.raise_for_status()
     return r.json()
 
 def mc_get(path: str) -> dict:
-    r = requests.get(f"{BASE}{path}", headers=headers(), timeout=30)
+    r = SESSION.get(f"{BASE}{path}", headers=headers(), timeout=30)
     if not r.ok:
         print(f"[MAILCHIMP] HTTP {r.status_code}: {r.text[:500]}")
         r.raise_for_status()
@@ -168,26 +191,42 @@ def mc_get(path: str) -> dict:
 # LOAD STORIES
 # ---------------------------------------------------------------------------
 
+# Look for og:image or twitter:image meta tags (either attribute order for og)
+OG_IMAGE_RES = [
+    re.compile(r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']', re.IGNORECASE),
+    re.compile(r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']', re.IGNORECASE),
+    re.compile(r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\']([^"\']+)["\']', re.IGNORECASE),
+]
+HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+
+
+def og_image_from_page(page: str) -> str:
+    """The og:image / twitter:image URL in a page's <head>, or ""."""
+    # Only scan the <head>, where the meta tags live, not the article body
+    end  = HEAD_END_RE.search(page)
+    head = page if end is None else page[:end.start()]
+    # First matching pattern wins
+    for pattern in OG_IMAGE_RES:
+        m = pattern.search(head)
+        if m:
+            # Attribute values are HTML-encoded (&amp; between query params);
+            # decode here so esc() in build_story_row encodes exactly once
+            img = html.unescape(m.group(1)).strip()
+            if img.startswith("http") and not img.endswith(".svg"):
+                return img
+    return ""
+
+
 def fetch_og_image(url: str) -> str:
     """Fetch the Open Graph image from a story URL."""
     try:
-        import re as _re
-        r = requests.get(url, timeout=8, headers={
+        r = SESSION.get(url, timeout=8, headers={
             "User-Agent": "Mozilla/5.0 (compatible; IBGNBot/1.0)"
         })
         if not r.ok:
             return ""
-        # Look for og:image or twitter:image meta tags
-        for pattern in [
-            r'<meta[^>]+property=["\']og:image["\'][^>]+content=["\']([^"\']+)["\']',
-            r'<meta[^>]+content=["\']([^"\']+)["\'][^>]+property=["\']og:image["\']',
-            r'<meta[^>]+name=["\']twitter:image["\'][^>]+content=["\']([^"\']+)["\']',
-        ]:
-            m = _re.search(pattern, r.text, _re.IGNORECASE)
-            if m:
-                img = m.group(1).strip()
-                if img.startswith("http") and not img.endswith(".svg"):
-                    return img
+        # Decode once (r.text re-decodes on every access)
+        return og_image_from_page(r.text)
     except Exception:
         pass
     return ""
@@ -257,11 +296,7 @@ def get_game_of_the_week() -> dict:
         print("[GOTW] No API key — using fallback.")
         return GOTW_FALLBACK
 
-    try:
-        from zoneinfo import ZoneInfo as _ZI
-        now_pt = datetime.now(_ZI("America/Los_Angeles"))
-    except Exception:
-        now_pt = datetime.now()
+    now_pt = datetime.now(PACIFIC_TZ)
 
     today_str    = now_pt.strftime("%Y-%m-%d")
     current_week = now_pt.strftime("%Y-W%W")
@@ -327,8 +362,7 @@ def get_game_of_the_week() -> dict:
 
         # Save cache
         try:
-            with open(cache_file, "w") as f:
-                _json.dump({"date": today_str, "week": current_week, "gotw": gotw}, f, indent=2)
+            write_text_atomic(cache_file, _json.dumps({"date": today_str, "week": current_week, "gotw": gotw}, indent=2))
         except Exception as ex:
             print(f"[GOTW] Cache write failed: {ex}")
 
@@ -346,13 +380,22 @@ def get_game_of_the_week() -> dict:
 STORY_ICONS = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
 STORY_COLORS = ["#FFD700", "#C0C0C0", "#CD7F32", "#4A9EFF", "#4A9EFF"]
 
+# Same mapping as html.escape(quote=True), applied in a single C-level pass
+HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+
+def esc(text: str) -> str:
+    return text.translate(HTML_ESCAPE)
+
+
 def build_story_row(index: int, story: dict) -> str:
     icon      = STORY_ICONS[index] if index < len(STORY_ICONS) else f"{index+1}."
     color     = STORY_COLORS[index] if index < len(STORY_COLORS) else "#4A9EFF"
-    title     = story.get("title", "").strip()
-    url       = story.get("url", "").strip()
-    source    = story.get("source", "").strip()
-    image_url = story.get("image_url", "").strip()
+    # Escape each field once up front; titles are plain text after strip_html
+    title     = esc(story.get("title", "").strip())
+    url       = esc(story.get("url", "").strip())
+    source    = esc(story.get("source", "").strip())
+    image_url = esc(story.get("image_url", "").strip())
 
     link_open  = f'<a href="{url}" style="text-decoration:none;color:inherit;" target="_blank">' if url else ""
     link_close = "</a>" if url else ""
@@ -406,13 +449,7 @@ def generate_trivia() -> tuple:
     try:
         import anthropic
         client = anthropic.Anthropic(api_key=api_key)
-        from datetime import date
-        try:
-            from zoneinfo import ZoneInfo
-            from datetime import datetime as _dt
-            today_pt = _dt.now(ZoneInfo("America/Los_Angeles")).date()
-        except Exception:
-            today_pt = date.today()
+        today_pt = datetime.now(PACIFIC_TZ).date()
         import random
         topics = [
             "a specific game release year", "a video game character's origin",
@@ -470,36 +507,37 @@ def generate_trivia() -> tuple:
         )
 
 
-def is_youtube_short(video_id: str) -> bool:
-    """Check if a YouTube video is a Short by seeing if /shorts/ URL resolves."""
-    try:
-        r = requests.head(
-            f"https://www.youtube.com/shorts/{video_id}",
-            headers={"User-Agent": "Mozilla/5.0"},
-            allow_redirects=True,
-            timeout=8,
-        )
-        # If the URL resolves to a shorts page (not redirected away), it's a Short
-        return "/shorts/" in r.url
-    except Exception:
-        return False
+YT_URL_ID_RES = [
+    re.compile(r"youtube\.com/watch\?v=([^&]+)"),
+    re.compile(r"youtu\.be/([^?]+)"),
+    re.compile(r"youtube\.com/shorts/([^?]+)"),
+]
 
 
 def get_youtube_video_id(url: str) -> str:
     """Extract video ID from a YouTube URL."""
-    patterns = [
-        r"youtube\.com/watch\?v=([^&]+)",
-        r"youtu\.be/([^?]+)",
-        r"youtube\.com/shorts/([^?]+)",
-    ]
-    for pattern in patterns:
-        m = re.search(pattern, url or "")
+    url = url or ""
+    # Every pattern needs "youtube.com" or "youtu.be" — a substring check
+    # rejects anything else (e.g. a bare channel handle) without the regexes
+    if "youtu" not in url:
+        return ""
+    for pattern in YT_URL_ID_RES:
+        m = pattern.search(url)
         if m:
             return m.group(1)
     return ""
 
 
 def build_html_email(stories: list, date_str: str, latest_yt_url: str = None) -> str:
+    # Trivia, Game of the Week and upcoming releases are independent API calls
+    # (two Anthropic requests + IGDB). Start them now so they overlap each other
+    # and the YouTube lookup below instead of running back to back.
+    executor   = concurrent.futures.ThreadPoolExecutor(max_workers=3)
+    f_trivia   = executor.submit(generate_trivia)
+    f_gotw     = executor.submit(get_game_of_the_week)
+    f_releases = executor.submit(fetch_upcoming_releases)
+    executor.shutdown(wait=False)
+
     story_rows  = "".join(build_story_row(i, s) for i, s in enumerate(stories))
     yt_link     = latest_yt_url or YOUTUBE_URL
     video_id    = get_youtube_video_id(yt_link)
@@ -510,29 +548,15 @@ def build_html_email(stories: list, date_str: str, latest_yt_url: str = None) ->
         try:
             channel_id = os.getenv("YOUTUBE_CHANNEL_ID", "UC0SJd4h7GQqoYTVjlDnSzqQ")
             rss = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-            r = requests.get(rss, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
+            r = SESSION.get(rss, headers={"User-Agent": "Mozilla/5.0"}, timeout=15)
             if r.ok:
-                entries = re.findall(r"<entry\b.*?</entry>", r.text, re.DOTALL)
-                for entry in entries[:25]:
-                    m_vid   = re.search(r"<yt:videoId>([^<]+)</yt:videoId>", entry)
-                    m_title = re.search(r"<title>([^<]+)</title>", entry)
-                    if not m_vid:
-                        continue
-                    vid         = m_vid.group(1).strip()
-                    title       = m_title.group(1).strip() if m_title else ""
-                    title_lower = title.lower()
-                    # Skip by title keyword first (fast)
-                    if "#shorts" in title_lower or " shorts" in title_lower or title_lower.endswith("shorts"):
-                        print(f"[MAILCHIMP] Skipping Short (title): {title}")
-                        continue
-                    # Then verify via URL check (reliable)
-                    if is_youtube_short(vid):
-                        print(f"[MAILCHIMP] Skipping Short (URL check): {title}")
-                        continue
-                    video_id = vid
+                # Feed-level Shorts filter first, then verify via URL check (reliable)
+                candidates = youtube_feed_candidates(r.text, log_prefix="[MAILCHIMP]")
+                found      = first_long_form(candidates, log_prefix="[MAILCHIMP]")
+                if found:
+                    video_id, title = found
                     yt_link  = f"https://www.youtube.com/watch?v={video_id}"
                     print(f"[MAILCHIMP] Found latest long-form video: {title}")
-                    break
         except Exception as ex:
             print(f"[MAILCHIMP] YouTube fetch failed: {ex}")
 
@@ -572,13 +596,13 @@ def build_html_email(stories: list, date_str: str, latest_yt_url: str = None) ->
         youtube_section = ""
 
     # Generate daily trivia question
-    trivia_question, trivia_answer = generate_trivia()
+    trivia_question, trivia_answer = f_trivia.result()
 
     # ---------------------------------------------------------------------------
     # GAME OF THE WEEK — Auto-generated every Sunday via Claude API
     # Falls back to manual pick if API unavailable
     # ---------------------------------------------------------------------------
-    gotw = get_game_of_the_week()
+    gotw = f_gotw.result()
 
     gotw_section = f"""
           <!-- GAME OF THE WEEK -->
@@ -615,7 +639,7 @@ def build_html_email(stories: list, date_str: str, latest_yt_url: str = None) ->
 
     # Fetch upcoming game releases
     try:
-        releases = fetch_upcoming_releases()
+        releases = f_releases.result()
     except Exception as ex:
         print(f"[MAILCHIMP] Could not fetch releases (non-fatal): {ex}")
         releases = []
@@ -800,11 +824,7 @@ def send_campaign(stories: list, latest_yt_url: str = None, post_date: str = "")
     # Use date from digest export (set at digest run time in PT)
     # Fall back to current PT time if not available
     if not post_date:
-        try:
-            from zoneinfo import ZoneInfo
-            today = datetime.now(ZoneInfo("America/Los_Angeles"))
-        except Exception:
-            today = datetime.now(timezone(timedelta(hours=-7)))
+        today = datetime.now(PACIFIC_TZ or timezone(timedelta(hours=-7)))
         post_date = today.strftime("%B %-d, %Y")
 
     date_str  = post_date
@@ -835,7 +855,7 @@ def send_campaign(stories: list, latest_yt_url: str = None, post_date: str = "")
 
     # 2. Set HTML content
     print("[MAILCHIMP] Setting email content...")
-    r = requests.put(
+    r = SESSION.put(
         f"{BASE}/campaigns/{campaign_id}/content",
         headers=headers(),
         json={"html": html_body},
@@ -847,7 +867,7 @@ def send_campaign(stories: list, latest_yt_url: str = None, post_date: str = "")
 
     # 3. Check campaign status before sending
     print("[MAILCHIMP] Checking campaign status...")
-    check = requests.get(f"{BASE}/campaigns/{campaign_id}", headers=headers(), timeout=30)
+    check = SESSION.get(f"{BASE}/campaigns/{campaign_id}", headers=headers(), timeout=30)
     if check.ok:
         data = check.json()
         status = data.get("status")
@@ -857,7 +877,7 @@ def send_campaign(stories: list, latest_yt_url: str = None, post_date: str = "")
 
     # 4. Send immediately
     print("[MAILCHIMP] Sending campaign...")
-    r = requests.post(
+    r = SESSION.post(
         f"{BASE}/campaigns/{campaign_id}/actions/send",
         headers=headers(),
         timeout=30,
@@ -881,11 +901,7 @@ def main():
         sys.exit(0)
 
     # Once-per-day guard — prevent sending twice in one day
-    try:
-        from zoneinfo import ZoneInfo as _ZI
-        today_str = datetime.now(_ZI("America/Los_Angeles")).strftime("%Y-%m-%d")
-    except Exception:
-        today_str = datetime.now().strftime("%Y-%m-%d")
+    today_str = datetime.now(PACIFIC_TZ).strftime("%Y-%m-%d")
 
     sent_cache = ".mailchimp_sent.json"
     sent_data  = {}
@@ -917,8 +933,7 @@ def main():
 
     # Mark as sent today
     try:
-        with open(sent_cache, "w") as f:
-            json.dump({"last_sent": today_str}, f)
+        write_text_atomic(sent_cache, json.dumps({"last_sent": today_str}))
     except Exception as ex:
         print(f"[MAILCHIMP] Could not write sent cache: {ex}")
 
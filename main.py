@@ -8,6 +8,8 @@ All heavy logic lives in shared.py.
 import os
 from typing import Dict, List
 
+import orjson
+
 from shared import (
     FEEDS,
     Item,
@@ -21,6 +23,7 @@ from shared import (
     discord_post_raw,
     hard_block,
     utcnow,
+    write_text_atomic,
 )
 
 # ---------------------------------------------------------------------------
@@ -34,6 +37,18 @@ MAX_POSTS_PER_RUN    = int(getenv("MAX_POSTS_PER_RUN", "12"))
 BREAKING_MODE        = getenv("BREAKING_MODE", "0") == "1"
 BREAKING_MAX_AGE_HOURS = int(getenv("BREAKING_MAX_AGE_HOURS", "72"))
 DEBUG                = getenv("DEBUG", "0") == "1"
+# Per-feed ETag/Last-Modified + parsed items, kept in the runner cache (not
+# committed) so unchanged feeds come back as 304s on the next run. One file
+# per mode: breaking runs cache items cut to their age window.
+FEED_META_FILE       = getenv("FEED_META_FILE", ".feed_meta.breaking.json" if BREAKING_MODE else ".feed_meta.json")
+
+
+def load_feed_meta() -> Dict:
+    try:
+        with open(FEED_META_FILE, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
 
 
 # ---------------------------------------------------------------------------
@@ -44,16 +59,24 @@ def main() -> None:
     if not DISCORD_WEBHOOK_URL:
         raise RuntimeError("DISCORD_WEBHOOK_URL is not set.")
 
-    state = load_state()
+    state     = load_state()
+    feed_meta = load_feed_meta()
 
     # --- Fetch + filter + cluster ---
     # In breaking mode, fetch_all_feeds skips hard_block and filters by
     # breaking keywords + age instead, so stories are never wrongly excluded.
+    # cache_ttl=0: every run revalidates, the cache only saves the re-download.
     all_items, reasons = fetch_all_feeds(
         FEEDS,
         breaking_mode=BREAKING_MODE,
         breaking_max_age_hours=BREAKING_MAX_AGE_HOURS,
+        feed_meta=feed_meta,
+        cache_ttl=0,
     )
+    try:
+        write_text_atomic(FEED_META_FILE, orjson.dumps(feed_meta).decode())
+    except OSError as e:
+        print(f"[WARN] Could not save feed cache: {e}")
 
     # --- Post loop ---
     posted       = 0
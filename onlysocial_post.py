@@ -7,6 +7,7 @@ connected social platforms via the OnlySocial API.
 Platforms: Bluesky, Facebook Page, LinkedIn
 """
 
+import itertools
 import json
 import os
 import re
@@ -14,6 +15,8 @@ import sys
 from datetime import datetime, timezone
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # CONFIG
@@ -39,6 +42,14 @@ TARGET_USERNAMES = {"smitty2447", "ryanandrewsmith247"}
 # Only these providers (text-only platforms)
 TARGET_PROVIDERS = {"blue_sky", "facebook_page", "linkedin", "linkedin_page", "threads"}
 
+# One session for the whole run: account listing, post creation and the
+# publish attempts all hit the same host. Only GETs are retried — a create
+# or publish POST is never replayed.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), allowed_methods=("GET",)),
+))
+
 # ---------------------------------------------------------------------------
 # HELPERS
 # ---------------------------------------------------------------------------
@@ -53,13 +64,13 @@ def headers() -> dict:
 
 
 def api_get(path: str) -> dict:
-    r = requests.get(f"{BASE}{path}", headers=headers(), timeout=30)
+    r = SESSION.get(f"{BASE}{path}", headers=headers(), timeout=30)
     r.raise_for_status()
     return r.json()
 
 
 def api_post(path: str, payload: dict) -> dict:
-    r = requests.post(
+    r = SESSION.post(
         f"{BASE}{path}",
         headers=headers(),
         json=payload,
@@ -71,18 +82,43 @@ def api_post(path: str, payload: dict) -> dict:
     return r.json()
 
 
+POST_UUID_KEYS    = ("uuid", "id", "postUuid", "post_uuid")
+POST_WRAPPER_KEYS = ("data", "payload", "post")
+
+
+def find_post_uuid(created) -> str:
+    """
+    Post UUID from a create-post response: top-level id keys first, then the
+    same keys inside wrapper objects, level by level (data.post.uuid works
+    too). Walks an explicit work list instead of recursing and returns on
+    the first hit, so later wrappers are never scanned.
+    """
+    nodes = [created]
+    for node in nodes:  # grows while iterating — breadth-first, no recursion
+        if not isinstance(node, dict):
+            continue
+        for key in POST_UUID_KEYS:
+            if node.get(key):
+                return str(node[key])
+        nodes.extend(node[k] for k in POST_WRAPPER_KEYS if isinstance(node.get(k), dict))
+    return ""
+
+
 # ---------------------------------------------------------------------------
 # ACCOUNT LISTING
 # ---------------------------------------------------------------------------
 
+ACCOUNT_LIST_KEYS = ("data", "accounts", "payload", "result")
+
+
 def list_accounts(workspace: str) -> list:
     data = api_get(f"/{workspace}/accounts")
-    if isinstance(data, dict):
-        for key in ("data", "accounts", "payload", "result"):
-            if key in data and isinstance(data[key], list):
-                return data[key]
     if isinstance(data, list):
         return data
+    if isinstance(data, dict):
+        for key in ACCOUNT_LIST_KEYS:
+            if isinstance(accounts := data.get(key), list):
+                return accounts
     return []
 
 
@@ -257,34 +293,21 @@ GENERIC_WORDS = {
 }
 
 
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
 def title_to_hashtags(titles: list) -> list:
     """
     Only generate hashtags from known game/brand names.
     Never guess from random words in titles.
     """
-    seen = set()
-    tags = []
-
     combined = " ".join(titles).lower()
 
-    # Check multi-word phrases first
-    for phrase, hashtag in PHRASE_HASHTAGS.items():
-        if phrase in combined and hashtag not in seen:
-            seen.add(hashtag)
-            tags.append(hashtag)
-            if len(tags) >= MAX_HASHTAGS - 1:
-                break
-
-    # Then check individual words against known hashtags only
-    if len(tags) < MAX_HASHTAGS - 1:
-        words = re.findall(r"[a-z0-9]+", combined)
-        for word in words:
-            if word in KNOWN_HASHTAGS and KNOWN_HASHTAGS[word] not in seen:
-                tag = KNOWN_HASHTAGS[word]
-                seen.add(tag)
-                tags.append(tag)
-                if len(tags) >= MAX_HASHTAGS - 1:
-                    break
+    # Multi-word phrases first, then individual words against known hashtags
+    # only; dict.fromkeys dedupes in first-seen order in a single pass.
+    phrase_tags = (hashtag for phrase, hashtag in PHRASE_HASHTAGS.items() if phrase in combined)
+    word_tags   = (KNOWN_HASHTAGS[m.group(0)] for m in WORD_RE.finditer(combined) if m.group(0) in KNOWN_HASHTAGS)
+    tags = list(dict.fromkeys(itertools.chain(phrase_tags, word_tags)))[:max(1, MAX_HASHTAGS - 1)]
 
     # Always append brand hashtag last
     tags.append("IttyBittyGamingNews")
@@ -295,35 +318,39 @@ def title_to_hashtags(titles: list) -> list:
 # POST CONTENT BUILDER
 # ---------------------------------------------------------------------------
 
-def build_post_content(stories: list) -> str:
-    icons = ["🥇", "🥈", "🥉", "4️⃣", "5️⃣"]
-    today = datetime.now(timezone.utc).strftime("%B %-d")
+POST_ICONS = ("🥇", "🥈", "🥉", "4️⃣", "5️⃣")
+LINKS_BLOCK = (
+    f"🎬 Watch daily: {YOUTUBE_URL}",
+    f"🎙️ Podcast: {PODCAST_URL}",
+    f"📧 Newsletter: {NEWSLETTER_URL}",
+)
+
+
+def post_header() -> str:
+    return f"🎮 Itty Bitty Gaming News — {datetime.now(timezone.utc):%B %-d}"
 
-    lines = [f"🎮 Itty Bitty Gaming News — {today}", ""]
 
+def short_headlines(stories: list) -> list:
+    """Top 3 headlines with medal icons, titles capped at 80 chars, no URLs."""
+    lines = []
+    for icon, story in zip(POST_ICONS[:3], stories):
+        title = story.get("title", "").strip()
+        lines.append(f"{icon} {title if len(title) <= 80 else title[:77] + '...'}")
+    return lines
+
+
+def build_post_content(stories: list) -> str:
+    lines  = [post_header(), ""]
     titles = []
-    for i, story in enumerate(stories[:5]):
-        icon  = icons[i] if i < len(icons) else f"{i+1}."
+    for icon, story in zip(POST_ICONS, stories):
         title = story.get("title", "").strip()
         url   = story.get("url", "").strip()
         titles.append(title)
+        lines.append(f"{icon} {title}")
         if url:
-            lines.append(f"{icon} {title}")
             lines.append(f"   {url}")
-        else:
-            lines.append(f"{icon} {title}")
-
-    lines.append("")
-    lines.append(f"🎬 Watch daily: {YOUTUBE_URL}")
-    lines.append(f"🎙️ Podcast: {PODCAST_URL}")
-    lines.append(f"📧 Newsletter: {NEWSLETTER_URL}")
-    lines.append("")
-    lines.append(TAGLINE)
-    lines.append("")
-
-    hashtags = title_to_hashtags(titles)
-    lines.append(" ".join(hashtags))
 
+    lines += ["", *LINKS_BLOCK, "", TAGLINE, "", " ".join(title_to_hashtags(titles))]
     return "\n".join(lines)
 
 
@@ -332,18 +359,7 @@ def build_bluesky_content(stories: list, hashtags: list) -> str:
     Bluesky hard limit: 300 chars.
     Format: header + top 3 headlines only (no URLs) + brand hashtag.
     """
-    today = datetime.now(timezone.utc).strftime("%B %-d")
-    icons = ["🥇", "🥈", "🥉"]
-    lines = [f"🎮 Itty Bitty Gaming News — {today}", ""]
-    for i, story in enumerate(stories[:3]):
-        title = story.get("title", "").strip()
-        # Truncate long titles
-        if len(title) > 80:
-            title = title[:77] + "..."
-        lines.append(f"{icons[i]} {title}")
-    lines.append("")
-    lines.append("#IttyBittyGamingNews")
-    content = "\n".join(lines)
+    content = "\n".join([post_header(), "", *short_headlines(stories), "", "#IttyBittyGamingNews"])
     # Hard trim as safety net
     if len(content) > 295:
         content = content[:292] + "..."
@@ -355,23 +371,9 @@ def build_threads_content(stories: list, hashtags: list) -> str:
     Threads limit: 500 chars.
     Format: header + top 3 headlines (no URLs) + YouTube link + hashtags.
     """
-    today = datetime.now(timezone.utc).strftime("%B %-d")
-    icons = ["🥇", "🥈", "🥉"]
-    lines = [f"🎮 Itty Bitty Gaming News — {today}", ""]
-    for i, story in enumerate(stories[:3]):
-        title = story.get("title", "").strip()
-        if len(title) > 80:
-            title = title[:77] + "..."
-        lines.append(f"{icons[i]} {title}")
-    lines.append("")
-    lines.append(f"🎬 Watch daily: {YOUTUBE_URL}")
-    lines.append(f"🎙️ Podcast: {PODCAST_URL}")
-    lines.append(f"📧 Newsletter: {NEWSLETTER_URL}")
-    lines.append("")
-    lines.append(TAGLINE)
-    lines.append("")
-    lines.append("#IttyBittyGamingNews")
-    content = "\n".join(lines)
+    content = "\n".join([
+        post_header(), "", *short_headlines(stories), "", *LINKS_BLOCK, "", TAGLINE, "", "#IttyBittyGamingNews",
+    ])
     if len(content) > 495:
         content = content[:492] + "..."
     return content
@@ -439,21 +441,7 @@ def create_and_post(workspace: str, accounts: list, full_content: str, bluesky_c
     created = api_post(f"/{workspace}/posts", payload)
     print(f"[ONLYSOCIAL] Create response: {json.dumps(created, indent=2)}")
 
-    # Find post UUID
-    post_uuid = None
-    if isinstance(created, dict):
-        for key in ("uuid", "id", "postUuid", "post_uuid"):
-            if key in created and created[key]:
-                post_uuid = str(created[key])
-                break
-        if not post_uuid:
-            for key in ("data", "payload", "post"):
-                if key in created and isinstance(created[key], dict):
-                    for k2 in ("uuid", "id", "postUuid", "post_uuid"):
-                        if created[key].get(k2):
-                            post_uuid = str(created[key][k2])
-                            break
-
+    post_uuid = find_post_uuid(created)
     if not post_uuid:
         print("[ONLYSOCIAL] Could not find post UUID in response.")
         sys.exit(1)
@@ -472,7 +460,7 @@ def create_and_post(workspace: str, accounts: list, full_content: str, bluesky_c
     for method, path, payload in publish_attempts:
         try:
             print(f"[ONLYSOCIAL] Trying: {method} {path}")
-            r = requests.post(
+            r = SESSION.post(
                 f"{BASE}{path}",
                 headers=headers(),
                 json=payload,
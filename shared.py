@@ -4,21 +4,28 @@ Single source of truth for feeds, filtering, fetching, deduplication, and scorin
 Imported by both main.py (RAW/breaking) and digest.py (newsletter).
 """
 
+import concurrent.futures
 import hashlib
-import json
+import html
+import itertools
 import os
 import re
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from io import BytesIO
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
 
 import feedparser
+import orjson
 import requests
-from bs4 import BeautifulSoup
 from dateutil import parser as dateparser
+from lxml import etree
 from rapidfuzz import fuzz
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # FEEDS
@@ -50,6 +57,7 @@ SOURCE_PRIORITY = [
     "GamesIndustry", "Nintendo Life", "Push Square", "Pure Xbox",
     "Game Rant",
 ]
+SOURCE_RANK = {name: i for i, name in enumerate(SOURCE_PRIORITY)}
 
 # ---------------------------------------------------------------------------
 # ENV HELPERS
@@ -64,7 +72,46 @@ USER_AGENT    = getenv("USER_AGENT", "IttyBittyGamingNewsBot/3.0")
 DEBUG         = getenv("DEBUG", "0") == "1"
 STATE_FILE    = getenv("STATE_FILE", "state.json")
 
+# Per-feed HTTP timeout as (connect, read) seconds. feedparser only ever sees
+# the downloaded bytes, and SESSION never retries a read timeout, so a slow
+# feed holds its worker for at most one read window (plus one connect retry).
+FEED_TIMEOUT  = (5, int(getenv("FEED_TIMEOUT_SECONDS", "15")))
+FEED_WORKERS  = int(getenv("FEED_WORKERS", "8"))
+
+# Feeds are newest-first, so only the head of each one is ever useful.
+MAX_ENTRIES_PER_FEED = int(getenv("MAX_ENTRIES_PER_FEED", "50"))
+OLD_ENTRY_STREAK     = 3   # consecutive out-of-window entries before we stop reading a feed
+# A feed fetched this recently (per feed_meta) is served from the cache with no
+# request at all — makes retries within the same posting window near-instant.
+FEED_CACHE_TTL       = int(getenv("FEED_CACHE_TTL_SECONDS", "1800"))
+SUMMARY_RAW_MAX      = 4000  # raw (pre-strip) summary chars kept per entry
+
 TITLE_FUZZY_THRESHOLD = int(getenv("TITLE_FUZZY_THRESHOLD", "92"))
+# Cross-source near-duplicate titles (character 4-gram Jaccard) are merged into one cluster
+NEAR_DUP_JACCARD      = float(getenv("NEAR_DUP_JACCARD", "0.8"))
+
+# One pooled session for every feed/article GET and Discord webhook POST so
+# keep-alive connections (and their TLS handshakes) are reused across feeds,
+# retries, posts, and worker threads. Only GET/HEAD are retried, so a webhook
+# post is never sent twice. Read timeouts are never retried (read=0) so
+# FEED_TIMEOUT stays a real per-feed cap; only 502/503/504 responses and a
+# single failed connect are.
+# Compression is pinned at the session level so per-call header dicts can
+# never drop it: gzip/deflate, plus br when brotli is installed (requests only
+# advertises what it can decode). resp.content is always decompressed bytes.
+SESSION = requests.Session()
+SESSION.headers["User-Agent"] = USER_AGENT
+SESSION.headers["Accept-Encoding"] = requests.utils.DEFAULT_ACCEPT_ENCODING
+_adapter = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(
+        total=2, connect=1, read=0, backoff_factor=0.3,
+        status_forcelist=(502, 503, 504), allowed_methods=("GET", "HEAD"),
+    ),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
 
 TRACKING_PARAMS = {
     "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
@@ -201,7 +248,7 @@ MARQUEE_TERMS = [
 # DATA MODEL
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class Item:
     source: str
     title: str
@@ -214,6 +261,23 @@ class Item:
     tags: List[str] = field(default_factory=list)
 
 
+def item_to_dict(item: Item) -> Dict:
+    d = asdict(item)
+    d["published_at"] = item.published_at.isoformat()
+    return d
+
+
+def item_from_dict(d: Dict) -> Item:
+    d = dict(d)
+    d["published_at"] = datetime.fromisoformat(d["published_at"])
+    return Item(**d)
+
+
+# Bump whenever Item's fields change: feed caches written under another
+# version are ignored (full refetch) instead of being rebuilt into Item.
+ITEM_CACHE_VERSION = 1
+
+
 # ---------------------------------------------------------------------------
 # UTILITIES
 # ---------------------------------------------------------------------------
@@ -223,8 +287,12 @@ def utcnow() -> datetime:
 
 
 def normalize_url(url: str) -> str:
+    url = url.strip()
     try:
-        parsed = urlparse(url.strip())
+        parsed = urlparse(url)
+        # Fast path: nothing to strip and host already lower-case
+        if "?" not in url and "#" not in url and parsed.netloc == parsed.netloc.lower():
+            return url
         query = [
             (k, v) for k, v in parse_qsl(parsed.query, keep_blank_values=True)
             if k.lower() not in TRACKING_PARAMS
@@ -239,13 +307,18 @@ def normalize_url(url: str) -> str:
         return url.strip()
 
 
+TAG_RE = re.compile(r"<[^>]+>")
+
+
 def strip_html(text: str) -> str:
     if not text:
         return ""
-    if "<" not in text and ">" not in text and "&" not in text:
-        return re.sub(r"\s+", " ", text).strip()
-    soup = BeautifulSoup(text, "html.parser")
-    return re.sub(r"\s+", " ", soup.get_text(" ", strip=True)).strip()
+    # Each pass only runs when its trigger character is present at all
+    if "<" in text:
+        text = TAG_RE.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return " ".join(text.split())
 
 
 def shorten(text: str, max_len: int = 320) -> str:
@@ -256,12 +329,16 @@ def shorten(text: str, max_len: int = 320) -> str:
 
 
 def contains_any(hay: str, terms: List[str]) -> bool:
-    h = hay.lower()
-    return any(t.lower() in h for t in terms)
+    # hay is lower-cased once by each caller and every term list is
+    # lower-case already, so nothing is re-lowered per term here.
+    return any(t in hay for t in terms)
+
+
+MONEY_RE = re.compile(r"(\$\d)|(\d+\s*%(\s*off)?)", re.IGNORECASE)
 
 
 def has_money_signals(text: str) -> bool:
-    return bool(re.search(r"(\$\d)|(\d+\s*%(\s*off)?)", text, re.IGNORECASE))
+    return bool(MONEY_RE.search(text))
 
 
 def game_or_adjacent(title: str, summary: str) -> bool:
@@ -273,6 +350,13 @@ def game_or_adjacent(title: str, summary: str) -> bool:
 # FILTERING
 # ---------------------------------------------------------------------------
 
+JUNK_TITLES = {
+    "quoteworthy", "release dates", "business and finance",
+    "headlines", "links", "morning brief", "afternoon brief",
+    "weekly recap", "daily brief", "round up", "roundup",
+}
+
+
 def hard_block(title: str, summary: str) -> str:
     """
     Returns empty string if item passes all filters.
@@ -285,15 +369,10 @@ def hard_block(title: str, summary: str) -> str:
         return "TITLE_TOO_SHORT"
 
     # Block known junk title patterns
-    JUNK_TITLES = {
-        "quoteworthy", "release dates", "business and finance",
-        "headlines", "links", "morning brief", "afternoon brief",
-        "weekly recap", "daily brief", "round up", "roundup",
-    }
     if title.strip().lower() in JUNK_TITLES:
         return "JUNK_TITLE"
 
-    if not game_or_adjacent(title, summary):
+    if not (contains_any(hay, GAME_TERMS) or contains_any(hay, ADJACENT_TERMS)):
         return "NOT_GAME_OR_ADJACENT"
     if contains_any(hay, COMMUNITY_OPINION_BLOCK):
         return "COMMUNITY/OPINION"
@@ -363,8 +442,7 @@ def compute_score(item: Item) -> int:
         score += 12
 
     # Source tier bonus
-    priority = {name: i for i, name in enumerate(SOURCE_PRIORITY)}
-    tier = priority.get(item.source, len(SOURCE_PRIORITY))
+    tier = SOURCE_RANK.get(item.source, len(SOURCE_PRIORITY))
     if tier <= 3:
         score += 10
     elif tier <= 7:
@@ -377,21 +455,23 @@ def compute_score(item: Item) -> int:
     return score
 
 
+TOPIC_NOISE_RE = re.compile(
+    r"\b(the|a|an|is|are|was|were|has|have|its|it|in|on|at|to|of|for|and|or|but|"
+    r"with|new|first|last|final|latest|official|full|big|review|trailer|"
+    r"video|watch|exclusive|breaking|report|says|get|gets|will|what|how|"
+    r"why|who|when|where|that|this|these|those)\b",
+    re.IGNORECASE,
+)
+
+
 def topic_similarity(title_a: str, title_b: str) -> int:
     """
     Returns a fuzzy similarity score 0-100 between two titles.
     Used by digest to penalise stories covering the same topic.
     Strips common noise words first for a cleaner match.
     """
-    noise = re.compile(
-        r"\b(the|a|an|is|are|was|were|has|have|its|it|in|on|at|to|of|for|and|or|but|"
-        r"with|new|first|last|final|latest|official|full|big|review|trailer|"
-        r"video|watch|exclusive|breaking|report|says|get|gets|will|what|how|"
-        r"why|who|when|where|that|this|these|those)\b",
-        re.IGNORECASE,
-    )
-    a = re.sub(r"\s+", " ", noise.sub(" ", title_a.lower())).strip()
-    b = re.sub(r"\s+", " ", noise.sub(" ", title_b.lower())).strip()
+    a = " ".join(TOPIC_NOISE_RE.sub(" ", title_a.lower()).split())
+    b = " ".join(TOPIC_NOISE_RE.sub(" ", title_b.lower()).split())
     return fuzz.token_set_ratio(a, b)
 
 
@@ -400,76 +480,108 @@ def topic_similarity(title_a: str, title_b: str) -> int:
 # TAGGING
 # ---------------------------------------------------------------------------
 
-def make_tags(title: str, summary: str) -> List[str]:
-    hay = f"{title} {summary}".lower()
-    tags: List[str] = []
-
-    tag_rules = [
-        (["announced", "announcement", "revealed", "reveal", "debut", "premiere"], "📣 ANNOUNCEMENT"),
-        (["drops today", "available now", "out now", "live now", "shadow drop", "shadowdrop"], "🚀 OUT NOW"),
-        (["patch", "hotfix"], "🔧 PATCH"),
-        (["update"], "🔄 UPDATE"),
-        (["delay", "delayed"], "⏳ DELAY"),
-        (["layoff", "layoffs", "laid off"], "💼 LAYOFFS"),
-        (["shut down", "shutdown", "closed", "closing", "closure"], "🔒 SHUTDOWN"),
-        (["acquisition", "acquired", "merger"], "🤝 M&A"),
-        (["lawsuit", "sued"], "⚖️ LEGAL"),
-        (["retire", "retirement"], "🎖️ RETIREMENT"),
-        (["price increase", "price hike"], "💸 PRICE CHANGE"),
-        (["release date", "launch date"], "📅 DATE CONFIRMED"),
-        (["free", "free to play", "f2p"], "🆓 FREE"),
-    ]
-
-    for keywords, label in tag_rules:
-        if contains_any(hay, keywords):
-            tags.append(label)
-
+TAG_RULES: List[Tuple[List[str], str]] = [
+    (["announced", "announcement", "revealed", "reveal", "debut", "premiere"], "📣 ANNOUNCEMENT"),
+    (["drops today", "available now", "out now", "live now", "shadow drop", "shadowdrop"], "🚀 OUT NOW"),
+    (["patch", "hotfix"], "🔧 PATCH"),
+    (["update"], "🔄 UPDATE"),
+    (["delay", "delayed"], "⏳ DELAY"),
+    (["layoff", "layoffs", "laid off"], "💼 LAYOFFS"),
+    (["shut down", "shutdown", "closed", "closing", "closure"], "🔒 SHUTDOWN"),
+    (["acquisition", "acquired", "merger"], "🤝 M&A"),
+    (["lawsuit", "sued"], "⚖️ LEGAL"),
+    (["retire", "retirement"], "🎖️ RETIREMENT"),
+    (["price increase", "price hike"], "💸 PRICE CHANGE"),
+    (["release date", "launch date"], "📅 DATE CONFIRMED"),
+    (["free", "free to play", "f2p"], "🆓 FREE"),
     # Platform tags
-    platform_rules = [
-        (["playstation", "ps5", "ps4"], "🎮 PlayStation"),
-        (["xbox", "game pass"], "🟢 Xbox"),
-        (["nintendo", "switch"], "🔴 Nintendo"),
-        (["steam", "pc gaming", " pc "], "🖥️ PC"),
-        (["mobile", "ios", "android"], "📱 Mobile"),
-    ]
-    for keywords, label in platform_rules:
-        if contains_any(hay, keywords):
-            tags.append(label)
+    (["playstation", "ps5", "ps4"], "🎮 PlayStation"),
+    (["xbox", "game pass"], "🟢 Xbox"),
+    (["nintendo", "switch"], "🔴 Nintendo"),
+    (["steam", "pc gaming", " pc "], "🖥️ PC"),
+    (["mobile", "ios", "android"], "📱 Mobile"),
+]
 
-    # Deduplicate preserving order
-    seen, out = set(), []
-    for t in tags:
-        if t not in seen:
-            seen.add(t)
-            out.append(t)
-    return out[:6]
+# One alternation per rule: a single combined pattern only records the first
+# matching branch at each offset, so rules whose keywords start at the same
+# place would hide each other.
+TAG_RULE_RES: List[Tuple[re.Pattern, str]] = [
+    (re.compile("|".join(re.escape(k) for k in keywords)), label)
+    for keywords, label in TAG_RULES
+]
+
+
+def make_tags(title: str, summary: str) -> List[str]:
+    hay = f"{title} {summary}".lower()
+    # Emit in rule order, not text order
+    tags = [label for rx, label in TAG_RULE_RES if rx.search(hay)]
+    return tags[:6]
 
 
 # ---------------------------------------------------------------------------
 # STORY KEY / DEDUPLICATION
 # ---------------------------------------------------------------------------
 
+URL_RE       = re.compile(r"https?://\S+")
+NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+
+
 def make_story_key(title: str) -> str:
-    t = re.sub(r"https?://\S+", "", title.lower())
-    t = re.sub(r"[^a-z0-9\s]", " ", t)
-    t = re.sub(r"\s+", " ", t).strip()
+    # Persisted in state.json, so this must stay stable across runs (no hash()).
+    t = URL_RE.sub("", title.lower())
+    t = NON_ALNUM_RE.sub(" ", t)
+    t = " ".join(t.split())
     return hashlib.sha1(t.encode("utf-8")).hexdigest()
 
 
 def pick_best_source(cluster: List[Item]) -> Item:
-    priority = {name: i for i, name in enumerate(SOURCE_PRIORITY)}
-    return sorted(
+    # min() is the same first-of-ties pick as sorted(...)[0] without the sort
+    return min(
         cluster,
-        key=lambda x: (priority.get(x.source, 999), -x.published_at.timestamp()),
-    )[0]
+        key=lambda x: (SOURCE_RANK.get(x.source, 999), -x.published_at.timestamp()),
+    )
+
+
+def title_shingles(title: str, k: int = 4) -> set:
+    """Character k-grams of the normalized title (punctuation/whitespace folded)."""
+    t = " ".join(NON_ALNUM_RE.sub(" ", title.lower()).split())
+    return {t[i:i + k] for i in range(len(t) - k + 1)}
+
+
+def merge_near_duplicates(groups: List[List[Item]]) -> List[List[Item]]:
+    """
+    Merge clusters whose lead titles have shingle Jaccard >= NEAR_DUP_JACCARD,
+    catching the same story reworded by different outlets. An inverted
+    shingle index means each title is only compared with clusters it shares
+    at least one shingle with.
+    """
+    merged: List[List[Item]] = []
+    shingles: List[set] = []
+    index: Dict[str, List[int]] = {}
+    for group in groups:
+        sh = title_shingles(group[0].title)
+        match = None
+        for j in sorted({j for s in sh for j in index.get(s, ())}):
+            inter = len(sh & shingles[j])
+            if inter / (len(sh) + len(shingles[j]) - inter) >= NEAR_DUP_JACCARD:
+                match = j
+                break
+        if match is not None:
+            merged[match].extend(group)
+            continue
+        for s in sh:
+            index.setdefault(s, []).append(len(merged))
+        merged.append(list(group))
+        shingles.append(sh)
+    return merged
 
 
 def cluster_items(items: List[Item]) -> List[Item]:
-    """Group by story_key, pick the best source per cluster."""
+    """Group by story_key, merge near-duplicate titles, pick the best source per cluster."""
     buckets: Dict[str, List[Item]] = {}
     for it in items:
         buckets.setdefault(it.story_key, []).append(it)
-    chosen = [pick_best_source(group) for group in buckets.values()]
+    chosen = [pick_best_source(group) for group in merge_near_duplicates(list(buckets.values()))]
     chosen.sort(key=lambda x: x.published_at, reverse=True)
     return chosen
 
@@ -481,26 +593,54 @@ def cluster_items(items: List[Item]) -> List[Item]:
 def load_state() -> Dict:
     if not os.path.exists(STATE_FILE):
         return {"seen_urls": [], "seen_titles": [], "seen_story_keys": []}
-    with open(STATE_FILE, "r", encoding="utf-8") as f:
-        state = json.load(f)
+    with open(STATE_FILE, "rb") as f:
+        state = orjson.loads(f.read())
     state.setdefault("seen_story_keys", [])
     return state
 
 
+def write_text_atomic(path: str, text: str) -> None:
+    """Write to a sibling temp file, then os.replace it over path (never a half-written file)."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
 def save_state(state: Dict) -> None:
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, ensure_ascii=False, indent=2)
+    # Underscore keys are in-memory lookup sets, not part of the file format.
+    # orjson's OPT_INDENT_2 output is byte-identical to json.dumps(indent=2,
+    # ensure_ascii=False) here, just several times faster on the ~1 MB state.
+    write_text_atomic(
+        STATE_FILE,
+        orjson.dumps({k: v for k, v in state.items() if not k.startswith("_")}, option=orjson.OPT_INDENT_2).decode(),
+    )
+
+
+def _seen_set(state: Dict, key: str) -> set:
+    """Set view of a seen_* list, built once per run for O(1) membership."""
+    cache_key = f"_{key}_set"
+    if cache_key not in state:
+        state[cache_key] = set(state[key])
+    return state[cache_key]
 
 
 def is_duplicate_or_allowed_update(item: Item, state: Dict) -> bool:
-    if item.url in state["seen_urls"]:
+    if item.url in _seen_set(state, "seen_urls"):
         return True
     is_update = contains_update_keyword(item.title, item.summary)
-    if item.story_key in state["seen_story_keys"] and not is_update:
+    if is_update:
+        return False
+    if item.story_key in _seen_set(state, "seen_story_keys"):
         return True
-    title_norm = re.sub(r"\s+", " ", item.title.strip().lower())
+    title_norm = " ".join(item.title.lower().split())
+    n = len(title_norm)
     for seen in state["seen_titles"][-500:]:
-        if fuzz.ratio(title_norm, seen) >= TITLE_FUZZY_THRESHOLD and not is_update:
+        # fuzz.ratio can't exceed 200*min(len)/sum(len), so lengths alone rule most titles out
+        m = len(seen)
+        if 200 * min(n, m) < TITLE_FUZZY_THRESHOLD * (n + m):
+            continue
+        if fuzz.ratio(title_norm, seen, score_cutoff=TITLE_FUZZY_THRESHOLD) >= TITLE_FUZZY_THRESHOLD:
             return True
     return False
 
@@ -508,28 +648,116 @@ def is_duplicate_or_allowed_update(item: Item, state: Dict) -> bool:
 def remember(item: Item, state: Dict) -> None:
     state["seen_urls"].append(item.url)
     state["seen_story_keys"].append(item.story_key)
-    state["seen_titles"].append(re.sub(r"\s+", " ", item.title.strip().lower()))
+    state["seen_titles"].append(" ".join(item.title.lower().split()))
+    _seen_set(state, "seen_urls").add(item.url)
+    _seen_set(state, "seen_story_keys").add(item.story_key)
     for key in ("seen_urls", "seen_story_keys", "seen_titles"):
-        state[key] = state[key][-5000:]
+        if len(state[key]) > 5000:
+            state[key] = state[key][-5000:]
+            state.pop(f"_{key}_set", None)
 
 
 # ---------------------------------------------------------------------------
 # FEED FETCHING
 # ---------------------------------------------------------------------------
 
+MRSS_NS             = "{http://search.yahoo.com/mrss/}"
+CONTENT_ENCODED_TAG = "{http://purl.org/rss/1.0/modules/content/}encoded"
+
+
+def _xml_media(el, entry: Dict) -> None:
+    """Collect media:content / media:thumbnail URLs (including inside media:group)."""
+    for child in el:
+        tag = child.tag if isinstance(child.tag, str) else ""
+        if tag == MRSS_NS + "content" and child.get("url"):
+            entry.setdefault("media_content", []).append({"url": child.get("url")})
+        elif tag == MRSS_NS + "thumbnail" and child.get("url"):
+            entry.setdefault("media_thumbnail", []).append({"url": child.get("url")})
+        elif tag == MRSS_NS + "group":
+            _xml_media(child, entry)
+
+
+def parse_feed_xml(data: bytes, max_entries: int = MAX_ENTRIES_PER_FEED) -> List[Dict]:
+    """
+    Fast RSS/Atom parse with lxml's C pull parser.
+    Returns feedparser-shaped entry dicts holding only the fields fetch_feed
+    reads, stopping after max_entries (the rest of the document is never
+    parsed). Raises etree.XMLSyntaxError on malformed XML before that point
+    so the caller can fall back to feedparser.
+    """
+    entries: List[Dict] = []
+    for _, el in etree.iterparse(BytesIO(data), events=("end",), tag=("{*}item", "{*}entry")):
+        entry: Dict = {}
+        content = ""
+        permalink = ""
+        for child in el:
+            if not isinstance(child.tag, str):
+                continue
+            name = child.tag.rpartition("}")[2]
+            if name == "title" and "title" not in entry:
+                # lxml already decoded entities; unescaping again would turn
+                # a literal "&amp;" in the title into "&"
+                entry["title"] = "".join(child.itertext())
+            elif name == "link":
+                href = child.get("href")
+                rel  = child.get("rel", "alternate")
+                if href is None:
+                    entry.setdefault("link", child.text or "")
+                elif rel == "alternate":
+                    entry.setdefault("link", href)
+                elif rel == "enclosure":
+                    entry.setdefault("enclosures", []).append({"href": href, "type": child.get("type", "")})
+            elif name == "guid" and child.get("isPermaLink", "true").lower() != "false":
+                permalink = permalink or (child.text or "").strip()
+            elif name in ("pubDate", "published", "date", "issued"):
+                entry.setdefault("published", child.text or "")
+            elif name in ("updated", "modified"):
+                entry.setdefault("updated", child.text or "")
+            elif name in ("description", "summary") and "summary" not in entry:
+                entry["summary"] = "".join(child.itertext())
+            elif (name == "content" and not child.tag.startswith(MRSS_NS)) or child.tag == CONTENT_ENCODED_TAG:
+                # Atom <content> / RSS content:encoded: feedparser's summary
+                # fallback when the entry has no description/summary
+                content = content or "".join(child.itertext())
+            elif name == "enclosure":
+                entry.setdefault("enclosures", []).append({"url": child.get("url", ""), "type": child.get("type", "")})
+        if content and "summary" not in entry:
+            entry["summary"] = content
+        # RSS items may carry their URL only as a permalink <guid> (feedparser
+        # uses it as the link the same way)
+        if permalink and not entry.get("link"):
+            entry["link"] = permalink
+        _xml_media(el, entry)
+        entries.append(entry)
+        if len(entries) >= max_entries:
+            break
+
+        # Drop parsed elements so memory stays flat on long feeds
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+    return entries
+
+
+DATE_PARSED_KEYS = ("published_parsed", "updated_parsed", "created_parsed")
+DATE_TEXT_KEYS   = ("published", "updated", "created", "date")
+
+
 def safe_parse_date(entry) -> datetime:
-    for attr in ("published_parsed", "updated_parsed"):
-        st = getattr(entry, attr, None)
+    for key in DATE_PARSED_KEYS:
+        st = entry.get(key)
         if st:
             try:
-                return datetime.fromtimestamp(time.mktime(st), tz=timezone.utc)
-            except Exception:
+                # feedparser's *_parsed tuples are already UTC; build directly
+                # (time.mktime would treat them as local time)
+                return datetime(st[0], st[1], st[2], st[3], st[4], st[5], tzinfo=timezone.utc)
+            except (TypeError, ValueError, IndexError):
                 pass
-    for key in ("published", "updated", "created", "date"):
-        val = getattr(entry, key, None)
+    for key in DATE_TEXT_KEYS:
+        val = entry.get(key)
         if val:
             try:
-                dt = dateparser.parse(val)
+                dt = parse_date_text(val)
                 if dt.tzinfo is None:
                     dt = dt.replace(tzinfo=timezone.utc)
                 return dt.astimezone(timezone.utc)
@@ -538,18 +766,35 @@ def safe_parse_date(entry) -> datetime:
     return utcnow()
 
 
+def parse_date_text(val: str) -> datetime:
+    """
+    Feed dates are nearly always ISO 8601 (Atom) or RFC 822 (RSS); both have
+    C-backed stdlib parsers that are far cheaper than dateutil's generic one,
+    which only sees whatever those two reject.
+    """
+    val = val.strip()
+    try:
+        if val[:4].isdigit():
+            return datetime.fromisoformat(val)
+        return parsedate_to_datetime(val)
+    except (TypeError, ValueError):
+        return dateparser.parse(val)
+
+
 def extract_from_entry(entry) -> Tuple[str, str]:
     """Extract summary text and image URL from a feed entry."""
     summary = ""
     for key in ("summary", "description", "subtitle"):
-        val = getattr(entry, key, None)
+        val = entry.get(key)
         if val:
-            summary = strip_html(val)
+            # Only the head of the summary is ever shown or matched on, so
+            # bound the stripping work instead of cleaning multi-kB bodies.
+            summary = strip_html(val[:SUMMARY_RAW_MAX])
             break
 
     image_url = ""
     for attr in ("media_content", "media_thumbnail"):
-        media = getattr(entry, attr, None)
+        media = entry.get(attr)
         if media and isinstance(media, list):
             for m in media:
                 u = (m.get("url") or "").strip()
@@ -560,7 +805,7 @@ def extract_from_entry(entry) -> Tuple[str, str]:
             break
 
     if not image_url:
-        enclosures = getattr(entry, "enclosures", None)
+        enclosures = entry.get("enclosures")
         if enclosures and isinstance(enclosures, list):
             for e in enclosures:
                 u = (e.get("href") or e.get("url") or "").strip()
@@ -572,40 +817,160 @@ def extract_from_entry(entry) -> Tuple[str, str]:
     return summary, image_url
 
 
+# Quoted attribute values may contain ">" (content="a > b")
+META_TAG_RE  = re.compile(r"""<meta\b(?:[^>"']|"[^"]*"|'[^']*')*>""", re.IGNORECASE)
+HEAD_END_RE  = re.compile(r"</head\s*>", re.IGNORECASE)
+META_ATTR_RE = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+
+
+def parse_meta_tags(page: str) -> Dict[str, Dict[str, str]]:
+    """
+    {"property": {...}, "name": {...}} -> content for each <meta> in the page
+    head (first occurrence wins). Regex scan instead of building a DOM.
+    """
+    end = HEAD_END_RE.search(page)
+    out: Dict[str, Dict[str, str]] = {"property": {}, "name": {}}
+    for tag in META_TAG_RE.finditer(page if end is None else page[:end.start()]):
+        attrs = {m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or "" for m in META_ATTR_RE.finditer(tag.group(0))}
+        content = html.unescape(attrs.get("content", ""))
+        for key in ("property", "name"):
+            if key in attrs:
+                out[key].setdefault(attrs[key], content)
+    return out
+
+
 def fetch_open_graph(url: str) -> Tuple[str, str]:
-    headers = {"User-Agent": USER_AGENT}
     try:
-        resp = requests.get(url, headers=headers, timeout=15)
+        resp = SESSION.get(url, timeout=15)
         resp.raise_for_status()
-        soup = BeautifulSoup(resp.text, "html.parser")
+        tags = parse_meta_tags(resp.text)
     except Exception:
         return "", ""
 
     def meta(name: str) -> str:
-        tag = soup.find("meta", attrs={"property": name}) or soup.find("meta", attrs={"name": name})
-        return (tag.get("content") or "").strip() if tag else ""
+        return (tags["property"].get(name) or tags["name"].get(name) or "").strip()
 
     desc = meta("og:description") or meta("description") or meta("twitter:description")
     img  = meta("og:image") or meta("twitter:image") or meta("twitter:image:src")
-    return strip_html(desc), img.strip()
+    # parse_meta_tags already unescaped (and meta() stripped) the content, so
+    # only the tag strip + whitespace collapse of strip_html is still needed.
+    if "<" in desc:
+        desc = TAG_RE.sub(" ", desc)
+    return " ".join(desc.split()), img
 
 
-def fetch_feed(feed_name: str, feed_url: str) -> List[Item]:
-    headers = {"User-Agent": USER_AGENT}
-    resp = requests.get(feed_url, headers=headers, timeout=20)
+def feed_response_headers(resp: requests.Response) -> Dict[str, str]:
+    """
+    HTTP headers for feedparser (it expects lower-case keys). Without them it
+    has to guess charset and format from the bytes; when the server sends a
+    generic/missing Content-Type, sniff Atom vs RSS from the document head.
+    """
+    headers = {k.lower(): v for k, v in resp.headers.items()}
+    ctype   = headers.get("content-type", "")
+    if "xml" not in ctype:
+        kind   = "application/atom+xml" if b"<feed" in resp.content[:512] else "application/rss+xml"
+        params = ctype.partition(";")[2]   # keep any charset the server did send
+        headers["content-type"] = f"{kind};{params}" if params else kind
+    return headers
+
+
+def fetch_feed(
+    feed_name: str,
+    feed_url: str,
+    max_age_hours: Optional[int] = None,
+    feed_meta: Optional[Dict] = None,
+    cache_ttl: int = FEED_CACHE_TTL,
+) -> List[Item]:
+    """
+    Fetch and parse one feed. When max_age_hours is given, entries older than
+    the window are dropped and reading stops after OLD_ENTRY_STREAK old entries
+    in a row (a short streak tolerates slightly out-of-order feeds).
+
+    feed_meta, if given, is a persisted {url: {etag, last_modified, body_sha1,
+    fetched_at, items, items_version, max_age_hours}} map: within cache_ttl seconds of the last fetch the cached
+    items are returned without a request; otherwise the request is made
+    conditional, and on 304 (or an identical body) the previously parsed items
+    are reused instead of re-parsing. A cache that can't be rebuilt into Items
+    (other ITEM_CACHE_VERSION, bad fields) or was cut to a different
+    max_age_hours window is dropped along with its validators.
+    """
+    cutoff = utcnow() - timedelta(hours=max_age_hours) if max_age_hours else None
+    meta   = feed_meta.get(feed_url, {}) if feed_meta is not None else {}
+
+    if "items" in meta:
+        try:
+            if meta.get("items_version") != ITEM_CACHE_VERSION:
+                raise ValueError(f"item cache version {meta.get('items_version')}")
+            # Items are stored already cut to the caller's window, so a cache
+            # written for another window (e.g. breaking mode's) is unusable
+            if "max_age_hours" not in meta or meta["max_age_hours"] != max_age_hours:
+                raise ValueError(f"items cached for max_age_hours={meta.get('max_age_hours')}")
+            cached = [item_from_dict(d) for d in meta["items"]]
+        except (TypeError, KeyError, ValueError) as e:
+            # Stale/corrupt cache: forget it and its validators so this run
+            # does a full unconditional fetch rather than failing every 304
+            print(f"[WARN] {feed_name}: discarding cached items ({e})")
+            meta = {}
+            feed_meta.pop(feed_url, None)
+
+    def cached_items() -> List[Item]:
+        return [it for it in cached if not cutoff or it.published_at >= cutoff]
+
+    if "items" in meta and time.time() - meta.get("fetched_at", 0) < cache_ttl:
+        if DEBUG:
+            print(f"[DEBUG] {feed_name}: fetched recently, reusing cached items")
+        return cached_items()
+
+    headers = {}
+    if "items" in meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = SESSION.get(feed_url, headers=headers, timeout=FEED_TIMEOUT)
+    if resp.status_code == 304 and "items" in meta:
+        if DEBUG:
+            print(f"[DEBUG] {feed_name}: not modified, reusing cached items")
+        meta["fetched_at"] = time.time()
+        return cached_items()
     resp.raise_for_status()
 
-    parsed = feedparser.parse(resp.text)
+    body_sha1 = hashlib.sha1(resp.content).hexdigest()
+    if "items" in meta and meta.get("body_sha1") == body_sha1:
+        meta["fetched_at"] = time.time()
+        return cached_items()
+
+    try:
+        entries = parse_feed_xml(resp.content)
+    except etree.XMLSyntaxError:
+        # Malformed XML — feedparser's forgiving parser handles most of these.
+        # Its HTML sanitizer / relative-URI rewriting are skipped: summaries go
+        # through strip_html anyway, so nothing downstream relies on them.
+        entries = feedparser.parse(
+            resp.content,
+            response_headers=feed_response_headers(resp),
+            sanitize_html=False,
+            resolve_relative_uris=False,
+        ).entries
     items: List[Item] = []
+    old_streak = 0
 
-    for entry in parsed.entries[:200]:
-        title = (getattr(entry, "title", "") or "").strip()
-        link  = (getattr(entry, "link",  "") or "").strip()
+    for entry in entries[:MAX_ENTRIES_PER_FEED]:
+        title = (entry.get("title") or "").strip()
+        link  = (entry.get("link")  or "").strip()
         if not title or not link:
             continue
 
-        url          = normalize_url(link)
         published_at = safe_parse_date(entry)
+        if cutoff and published_at < cutoff:
+            old_streak += 1
+            if old_streak >= OLD_ENTRY_STREAK:
+                break
+            continue
+        old_streak = 0
+
+        url          = normalize_url(link)
         summary, img = extract_from_entry(entry)
         tags         = make_tags(title, summary)
 
@@ -620,18 +985,50 @@ def fetch_feed(feed_name: str, feed_url: str) -> List[Item]:
             tags=tags,
         ))
 
+    if feed_meta is not None:
+        feed_meta[feed_url] = {
+            "etag":          resp.headers.get("ETag", ""),
+            "last_modified": resp.headers.get("Last-Modified", ""),
+            "body_sha1":     body_sha1,
+            "fetched_at":    time.time(),
+            "items":         [item_to_dict(it) for it in items],
+            "items_version": ITEM_CACHE_VERSION,
+            "max_age_hours": max_age_hours,
+        }
+
     return items
 
 
+def filter_reason(it: Item, breaking_mode: bool, breaking_max_age_hours: int) -> str:
+    """Why an item is dropped by fetch_all_feeds ("" = keep)."""
+    if breaking_mode:
+        # Must be game/adjacent first
+        if not game_or_adjacent(it.title, it.summary):
+            return "NOT_GAME_OR_ADJACENT"
+        # Must have a breaking keyword and be recent enough
+        if not is_breaking(it.title, it.summary, it.published_at, breaking_max_age_hours):
+            return "NOT_BREAKING_KEYWORD_OR_TOO_OLD"
+        return ""
+    return hard_block(it.title, it.summary)
+
+
 def fetch_all_feeds(
     feed_list: Optional[List[Dict]] = None,
     breaking_mode: bool = False,
     breaking_max_age_hours: int = 72,
+    max_age_hours: Optional[int] = None,
+    feed_meta: Optional[Dict] = None,
+    cache_ttl: int = FEED_CACHE_TTL,
 ) -> Tuple[List[Item], Dict[str, int]]:
     """
     Fetch all feeds, apply filters, cluster duplicates.
     Returns (clustered_items, filter_reason_counts).
 
+    max_age_hours drops entries older than the window while parsing
+    (breaking_mode defaults it to breaking_max_age_hours). feed_meta enables
+    conditional GETs; the caller owns persisting it (see fetch_feed). Pass
+    cache_ttl=0 to always revalidate instead of serving recent fetches as-is.
+
     breaking_mode=True:
       - Skips hard_block (so rumor/opinion filters don't kill breaking stories)
       - Only keeps items that pass is_breaking() — must have a breaking keyword
@@ -642,46 +1039,157 @@ def fetch_all_feeds(
       - Full hard_block filter pipeline
     """
     feed_list = feed_list or FEEDS
-    raw_items: List[Item] = []
-
-    for f in feed_list:
-        try:
-            raw_items.extend(fetch_feed(f["name"], f["url"]))
-            if DEBUG:
-                print(f"[DEBUG] Fetched {f['name']}: OK")
-        except Exception as e:
-            print(f"[WARN] Feed fetch failed: {f['name']} -> {e}")
+    if breaking_mode and max_age_hours is None:
+        max_age_hours = breaking_max_age_hours
 
     reasons: Dict[str, int] = {}
-    filtered: List[Item] = []
-
-    for it in raw_items:
-        if breaking_mode:
-            # Must be game/adjacent first
-            if not game_or_adjacent(it.title, it.summary):
-                reasons["NOT_GAME_OR_ADJACENT"] = reasons.get("NOT_GAME_OR_ADJACENT", 0) + 1
+    # Kept per feed (in feed_list order) so the clustered output doesn't
+    # depend on which fetch happened to finish first
+    per_feed: List[List[Item]] = [[] for _ in feed_list]
+
+    # Feed fetches are almost entirely network wait, so overlap them. Filtering
+    # stays on this thread and runs per feed as it lands, overlapping the
+    # CPU-side work with the fetches still in flight (no shared-state locking).
+    workers = max(1, min(FEED_WORKERS, len(feed_list)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(fetch_feed, f["name"], f["url"], max_age_hours, feed_meta, cache_ttl): i
+            for i, f in enumerate(feed_list)
+        }
+        for fut in concurrent.futures.as_completed(futures):
+            i = futures[fut]
+            f = feed_list[i]
+            try:
+                items = fut.result()
+                if DEBUG:
+                    print(f"[DEBUG] Fetched {f['name']}: OK")
+            except Exception as e:
+                print(f"[WARN] Feed fetch failed: {f['name']} -> {e}")
                 continue
-            # Must have a breaking keyword and be recent enough
-            if is_breaking(it.title, it.summary, it.published_at, breaking_max_age_hours):
-                filtered.append(it)
-            else:
-                r = "NOT_BREAKING_KEYWORD_OR_TOO_OLD"
-                reasons[r] = reasons.get(r, 0) + 1
-        else:
-            r = hard_block(it.title, it.summary)
-            if r == "":
-                filtered.append(it)
-            else:
-                reasons[r] = reasons.get(r, 0) + 1
-
-    clustered = cluster_items(filtered)
+
+            for it in items:
+                r = filter_reason(it, breaking_mode, breaking_max_age_hours)
+                if r == "":
+                    per_feed[i].append(it)
+                else:
+                    reasons[r] = reasons.get(r, 0) + 1
+
+    clustered = cluster_items([it for items in per_feed for it in items])
     return clustered, reasons
 
 
+# ---------------------------------------------------------------------------
+# YOUTUBE  (latest long-form upload, used by digest and the Mailchimp email)
+# ---------------------------------------------------------------------------
+
+YT_ENTRY_RE    = re.compile(r"<entry\b.*?</entry>", re.DOTALL)
+YT_VIDEO_ID_RE = re.compile(r"<yt:videoId>([^<]+)</yt:videoId>")
+YT_TITLE_RE    = re.compile(r"<title>([^<]+)</title>")
+YT_LINK_RE     = re.compile(r'<link rel="alternate" href="([^"]+)"')
+YT_FEED_MAX_ENTRIES = 25   # only the newest uploads matter
+
+
+def youtube_feed_candidates(feed_text: str, filter_shorts: bool = True, log_prefix: str = "[YT]") -> List[Tuple[str, str]]:
+    """
+    (video_id, title) for the newest entries of a channel's Atom feed, in feed
+    order (title "" if missing). With filter_shorts, entries the feed itself
+    gives away as Shorts (a /shorts/ link or a "shorts" title) are dropped;
+    first_long_form() does the network check on the rest.
+    """
+    candidates: List[Tuple[str, str]] = []
+    for m_entry in itertools.islice(YT_ENTRY_RE.finditer(feed_text), YT_FEED_MAX_ENTRIES):
+        entry   = m_entry.group(0)
+        m_vid   = YT_VIDEO_ID_RE.search(entry)
+        m_title = YT_TITLE_RE.search(entry)
+        if not m_vid:
+            continue
+        vid   = m_vid.group(1).strip()
+        title = m_title.group(1).strip() if m_title else ""
+        if filter_shorts:
+            # The feed links Shorts as /shorts/<id> — free and decisive, so
+            # check it before the title heuristics
+            m_link = YT_LINK_RE.search(entry)
+            if m_link and "/shorts/" in m_link.group(1):
+                print(f"{log_prefix} Skipping Short (link): {title}")
+                continue
+            t = title.lower()
+            if "#shorts" in t or " shorts" in t or t.endswith("shorts"):
+                print(f"{log_prefix} Skipping Short (title): {title}")
+                continue
+        candidates.append((vid, title))
+    return candidates
+
+
+def is_youtube_short(vid: str) -> bool:
+    """URL-based check — reliable Shorts detection (a Short stays on /shorts/)."""
+    try:
+        r = SESSION.head(
+            f"https://www.youtube.com/shorts/{vid}",
+            headers={"User-Agent": "Mozilla/5.0"},
+            allow_redirects=True,
+            timeout=8,
+        )
+        return "/shorts/" in r.url
+    except Exception:
+        return False
+
+
+def first_long_form(candidates: List[Tuple[str, str]], log_prefix: str = "[YT]") -> Optional[Tuple[str, str]]:
+    """
+    Return the first (vid, title) in feed order that isn't a Short.
+    The Shorts probes run concurrently; once the answer is known, any
+    probes that haven't started are cancelled.
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+    try:
+        probes = executor.map(is_youtube_short, [vid for vid, _ in candidates])
+        for (vid, title), is_short in zip(candidates, probes):
+            if is_short:
+                print(f"{log_prefix} Skipping Short (URL check): {title}")
+                continue
+            return (vid, title)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return None
+
+
 # ---------------------------------------------------------------------------
 # DISCORD HELPERS
 # ---------------------------------------------------------------------------
 
+# Webhook bodies are serialized with orjson (C, UTF-8 bytes) rather than
+# requests' json= path, so the content type has to be set by hand.
+JSON_HEADERS = {"Content-Type": "application/json"}
+DISCORD_MAX_WAIT = 10.0  # seconds; longest rate-limit wait honoured before giving up
+
+
+def _header_seconds(resp: requests.Response, name: str) -> float:
+    try:
+        return min(max(float(resp.headers.get(name, 0)), 0.0), DISCORD_MAX_WAIT)
+    except ValueError:
+        return 1.0
+
+
+def send_webhook(webhook_url: str, payload: Dict) -> None:
+    """
+    POST a webhook payload. Posts stay strictly sequential (message order
+    matters), so pacing follows Discord's own headers instead of fixed
+    sleeps: a 429 is retried once after Retry-After, and a drained bucket
+    (X-RateLimit-Remaining: 0) waits out its reset before returning so the
+    next post doesn't hit the limit.
+    """
+    body = orjson.dumps(payload)
+    resp = SESSION.post(webhook_url, data=body, headers=JSON_HEADERS, timeout=20)
+    if resp.status_code == 429:
+        wait = _header_seconds(resp, "Retry-After")
+        print(f"[DISCORD] Rate limited — retrying in {wait:.1f}s")
+        time.sleep(wait)
+        resp = SESSION.post(webhook_url, data=body, headers=JSON_HEADERS, timeout=20)
+    resp.raise_for_status()
+    if resp.headers.get("X-RateLimit-Remaining") == "0":
+        time.sleep(_header_seconds(resp, "X-RateLimit-Reset-After"))
+
+
 def discord_post_raw(item: Item, webhook_url: str) -> None:
     """Post a single news item as a Discord embed (RAW / breaking mode)."""
     summary   = item.summary or ""
@@ -713,8 +1221,7 @@ def discord_post_raw(item: Item, webhook_url: str) -> None:
     if image_url:
         embed["image"] = {"url": image_url}
 
-    resp = requests.post(webhook_url, json={"embeds": [embed]}, timeout=20)
-    resp.raise_for_status()
+    send_webhook(webhook_url, {"embeds": [embed]})
 
 
 def post_webhook(webhook_url: str, content: str = "", embeds: Optional[List[Dict]] = None) -> None:
@@ -724,5 +1231,4 @@ def post_webhook(webhook_url: str, content: str = "", embeds: Optional[List[Dict
         payload["content"] = content
     if embeds:
         payload["embeds"] = embeds[:10]
-    resp = requests.post(webhook_url, json=payload, timeout=20)
-    resp.raise_for_status()
+    send_webhook(webhook_url, payload)
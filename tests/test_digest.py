@@ -0,0 +1,38 @@
+import orjson
+
+import digest
+
+
+def test_feed_items_stay_out_of_committed_cache(tmp_path, monkeypatch):
+    cache_file = tmp_path / "cache.json"
+    items_file = tmp_path / "items.json"
+    monkeypatch.setattr(digest, "DIGEST_CACHE_FILE", str(cache_file))
+    monkeypatch.setattr(digest, "DIGEST_FEED_ITEMS_FILE", str(items_file))
+
+    meta = {
+        "etag": '"abc"',
+        "last_modified": "",
+        "body_sha1": "f" * 40,
+        "fetched_at": 1.0,
+        "items": [{"title": "x"}],
+        "items_version": 1,
+    }
+    digest.save_cache({"posted_dates": [], "feed_meta": {"https://example.com/feed": dict(meta)}})
+
+    committed = orjson.loads(cache_file.read_bytes())
+    assert committed["feed_meta"]["https://example.com/feed"] == {
+        "etag": '"abc"', "last_modified": "", "body_sha1": "f" * 40, "fetched_at": 1.0,
+    }
+    assert digest.load_cache()["feed_meta"]["https://example.com/feed"] == meta
+
+
+def test_feed_items_from_another_body_are_not_rejoined(tmp_path, monkeypatch):
+    cache_file = tmp_path / "cache.json"
+    items_file = tmp_path / "items.json"
+    monkeypatch.setattr(digest, "DIGEST_CACHE_FILE", str(cache_file))
+    monkeypatch.setattr(digest, "DIGEST_FEED_ITEMS_FILE", str(items_file))
+
+    cache_file.write_bytes(orjson.dumps({"feed_meta": {"u": {"etag": '"new"', "body_sha1": "b" * 40}}}))
+    items_file.write_bytes(orjson.dumps({"u": {"body_sha1": "a" * 40, "items": [], "items_version": 1}}))
+
+    assert "items" not in digest.load_cache()["feed_meta"]["u"]
@@ -0,0 +1,20 @@
+from mailchimp_send import build_story_row, og_image_from_page
+
+
+def test_og_image_entities_decoded_once():
+    page = (
+        '<html><head>'
+        '<meta property="og:image" content="https://cdn.example.com/a.jpg?w=1&amp;h=2">'
+        '</head><body></body></html>'
+    )
+    img = og_image_from_page(page)
+    assert img == "https://cdn.example.com/a.jpg?w=1&h=2"
+
+    row = build_story_row(0, {"title": "T", "url": "https://example.com", "source": "S", "image_url": img})
+    assert 'src="https://cdn.example.com/a.jpg?w=1&amp;h=2"' in row
+    assert "&amp;amp;" not in row
+
+
+def test_og_image_ignores_body_after_uppercase_head_end():
+    page = '<HTML><HEAD></HEAD><BODY><meta property="og:image" content="https://x.example.com/b.jpg"></BODY>'
+    assert og_image_from_page(page) == ""
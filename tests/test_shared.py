@@ -0,0 +1,218 @@
+import shared
+from shared import parse_feed_xml
+
+
+ATOM_CONTENT_ONLY = b"""<?xml version="1.0"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:media="http://search.yahoo.com/mrss/">
+  <entry>
+    <title>Switch news</title>
+    <link href="https://example.com/a"/>
+    <updated>2026-10-16T10:00:00Z</updated>
+    <media:content url="https://img.example.com/a.jpg"/>
+    <content type="html">&lt;p&gt;Nintendo today revealed a new Direct.&lt;/p&gt;</content>
+  </entry>
+</feed>"""
+
+RSS_ENCODED_ONLY = b"""<?xml version="1.0"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <item>
+      <title>Switch news</title>
+      <link>https://example.com/b</link>
+      <content:encoded><![CDATA[<p>Nintendo today revealed a new Direct.</p>]]></content:encoded>
+    </item>
+  </channel>
+</rss>"""
+
+
+def test_parse_feed_xml_atom_content_fills_summary():
+    entry = parse_feed_xml(ATOM_CONTENT_ONLY)[0]
+    assert "Nintendo today revealed" in entry["summary"]
+    # media:content is still read as media, not as the body
+    assert entry["media_content"] == [{"url": "https://img.example.com/a.jpg"}]
+
+
+def test_parse_feed_xml_rss_content_encoded_fills_summary():
+    entry = parse_feed_xml(RSS_ENCODED_ONLY)[0]
+    assert "Nintendo today revealed" in entry["summary"]
+
+
+def test_parse_feed_xml_description_wins_over_content():
+    data = RSS_ENCODED_ONLY.replace(b"<title>", b"<description>Short blurb</description><title>")
+    assert parse_feed_xml(data)[0]["summary"] == "Short blurb"
+
+
+class FakeResponse:
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.content     = content
+        self.status_code = status_code
+        self.headers     = {"Content-Type": "application/rss+xml"}
+
+    def raise_for_status(self):
+        pass
+
+
+RSS_FRESH = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><item>
+  <title>Fresh story</title>
+  <link>https://example.com/fresh</link>
+  <description>Body</description>
+</item></channel></rss>"""
+
+
+def test_fetch_feed_discards_unreadable_item_cache(monkeypatch):
+    url  = "https://example.com/feed"
+    meta = {url: {
+        "etag": '"abc"',
+        "last_modified": "Wed, 14 Oct 2026 10:00:00 GMT",
+        "body_sha1": "0" * 40,
+        "fetched_at": 0,
+        "items": [{"source": "S", "headline": "renamed field", "url": "u", "published_at": "2026-10-14T10:00:00+00:00"}],
+        "items_version": shared.ITEM_CACHE_VERSION,
+    }}
+    sent = {}
+
+    def fake_get(feed_url, headers=None, timeout=None):
+        sent.update(headers or {})
+        return FakeResponse(RSS_FRESH)
+
+    monkeypatch.setattr(shared.SESSION, "get", fake_get)
+    items = shared.fetch_feed("S", url, feed_meta=meta, cache_ttl=0)
+
+    assert [it.title for it in items] == ["Fresh story"]
+    assert "If-None-Match" not in sent and "If-Modified-Since" not in sent
+    assert meta[url]["items_version"] == shared.ITEM_CACHE_VERSION
+
+
+def test_fetch_feed_ignores_other_item_cache_version(monkeypatch):
+    url  = "https://example.com/feed"
+    meta = {url: {"etag": '"abc"', "fetched_at": 0, "items": []}}   # pre-versioning cache
+    sent = {}
+
+    def fake_get(feed_url, headers=None, timeout=None):
+        sent.update(headers or {})
+        return FakeResponse(RSS_FRESH)
+
+    monkeypatch.setattr(shared.SESSION, "get", fake_get)
+    items = shared.fetch_feed("S", url, feed_meta=meta, cache_ttl=3600)
+
+    assert [it.title for it in items] == ["Fresh story"]
+    assert "If-None-Match" not in sent
+
+
+def test_make_tags_matches_every_rule_keyword():
+    for keywords, label in shared.TAG_RULES:
+        for k in keywords:
+            assert label in shared.make_tags(f"Studio {k} today", ""), (k, label)
+
+
+def test_make_tags_same_as_substring_rules():
+    hay = "Nintendo shut down the Switch update; patch delayed, free to play on PlayStation"
+    expected = [label for keywords, label in shared.TAG_RULES if any(k in hay.lower() for k in keywords)][:6]
+    assert shared.make_tags(hay, "") == expected
+
+
+def test_parse_meta_tags_quoted_gt_and_uppercase_head():
+    page = (
+        '<HTML><HEAD>'
+        '<meta name="description" content="a > b">'
+        '<meta property="og:image" content="https://img.example.com/a.jpg">'
+        '</HEAD><BODY>'
+        '<meta property="og:title" content="from the body">'
+        '</BODY></HTML>'
+    )
+    tags = shared.parse_meta_tags(page)
+    assert tags["name"]["description"] == "a > b"
+    assert tags["property"]["og:image"] == "https://img.example.com/a.jpg"
+    assert "og:title" not in tags["property"]
+
+
+def rss_item(inner: bytes) -> bytes:
+    return b'<?xml version="1.0"?><rss version="2.0"><channel><item>' + inner + b"</item></channel></rss>"
+
+
+def test_parse_feed_xml_permalink_guid_is_the_link():
+    entry = parse_feed_xml(rss_item(b'<title>T</title><guid isPermaLink="true">https://example.com/g</guid>'))[0]
+    assert entry["link"] == "https://example.com/g"
+    # Default isPermaLink is true
+    entry = parse_feed_xml(rss_item(b"<title>T</title><guid>https://example.com/g</guid>"))[0]
+    assert entry["link"] == "https://example.com/g"
+
+
+def test_parse_feed_xml_non_permalink_guid_is_ignored():
+    entry = parse_feed_xml(rss_item(b'<title>T</title><guid isPermaLink="false">tag:example.com,1</guid>'))[0]
+    assert "link" not in entry
+    entry = parse_feed_xml(rss_item(
+        b'<title>T</title><guid>https://example.com/g</guid><link>https://example.com/l</link>'
+    ))[0]
+    assert entry["link"] == "https://example.com/l"
+
+
+def test_parse_feed_xml_title_entities_decoded_once():
+    assert parse_feed_xml(rss_item(b"<title>A &amp;amp; B</title>"))[0]["title"] == "A &amp; B"
+    assert parse_feed_xml(rss_item(b"<title>A &amp; B</title>"))[0]["title"] == "A & B"
+
+
+def test_session_never_retries_read_timeouts():
+    retry = shared.SESSION.get_adapter("https://example.com").max_retries
+    assert retry.read == 0
+    assert retry.connect == 1
+
+
+def cached_feed_meta(url: str, max_age_hours):
+    item = shared.Item(
+        source="S", title="Cached story", url="https://example.com/cached",
+        published_at=shared.utcnow(),
+    )
+    return {url: {
+        "etag": '"abc"', "last_modified": "", "body_sha1": "0" * 40, "fetched_at": 0,
+        "items": [shared.item_to_dict(item)],
+        "items_version": shared.ITEM_CACHE_VERSION,
+        "max_age_hours": max_age_hours,
+    }}
+
+
+def test_fetch_feed_reuses_items_cached_for_the_same_window(monkeypatch):
+    url  = "https://example.com/feed"
+    meta = cached_feed_meta(url, 72)
+    monkeypatch.setattr(shared.SESSION, "get", lambda *a, **kw: FakeResponse(b"", status_code=304))
+    items = shared.fetch_feed("S", url, max_age_hours=72, feed_meta=meta, cache_ttl=0)
+    assert [it.title for it in items] == ["Cached story"]
+
+
+def test_fetch_feed_refetches_items_cached_for_another_window(monkeypatch):
+    url  = "https://example.com/feed"
+    meta = cached_feed_meta(url, 72)
+    sent = {}
+
+    def fake_get(feed_url, headers=None, timeout=None):
+        sent.update(headers or {})
+        return FakeResponse(RSS_FRESH)
+
+    monkeypatch.setattr(shared.SESSION, "get", fake_get)
+    items = shared.fetch_feed("S", url, feed_meta=meta, cache_ttl=3600)
+
+    assert [it.title for it in items] == ["Fresh story"]
+    assert "If-None-Match" not in sent
+    assert meta[url]["max_age_hours"] is None
+
+
+YT_FEED = """<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015">
+<entry><yt:videoId>short1</yt:videoId><title>Quick tip</title>
+  <link rel="alternate" href="https://www.youtube.com/shorts/short1"/></entry>
+<entry><yt:videoId>short2</yt:videoId><title>Switch 2 news #shorts</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=short2"/></entry>
+<entry><yt:videoId>long1</yt:videoId><title>Weekly Gaming News</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=long1"/></entry>
+</feed>"""
+
+
+def test_youtube_feed_candidates_drops_feed_marked_shorts():
+    assert shared.youtube_feed_candidates(YT_FEED) == [("long1", "Weekly Gaming News")]
+    assert [vid for vid, _ in shared.youtube_feed_candidates(YT_FEED, filter_shorts=False)] == ["short1", "short2", "long1"]
+
+
+def test_first_long_form_skips_url_checked_shorts(monkeypatch):
+    monkeypatch.setattr(shared, "is_youtube_short", lambda vid: vid == "a")
+    assert shared.first_long_form([("a", "A"), ("b", "B"), ("c", "C")]) == ("b", "B")
+    assert shared.first_long_form([("a", "A")]) is None
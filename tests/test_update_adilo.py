@@ -0,0 +1,30 @@
+import update_adilo
+
+
+def run_walk(monkeypatch, page_one_results):
+    """find_newest_video with every page empty except page 1, which yields page_one_results in turn."""
+    calls = []
+    results = iter(page_one_results)
+
+    def fake_fetch_page(from_idx, to_idx):
+        calls.append(from_idx)
+        return next(results) if from_idx == 1 else []
+
+    monkeypatch.setattr(update_adilo, "ADILO_PUBLIC_KEY", "pub")
+    monkeypatch.setattr(update_adilo, "ADILO_SECRET_KEY", "sec")
+    monkeypatch.setattr(update_adilo, "ADILO_PROJECT_ID", "proj")
+    monkeypatch.setattr(update_adilo, "FETCH_FROM", 500)
+    monkeypatch.setattr(update_adilo, "fetch_page", fake_fetch_page)
+    return update_adilo.find_newest_video(), calls
+
+
+def test_empty_page_one_is_not_fetched_twice(monkeypatch):
+    newest, calls = run_walk(monkeypatch, [[]])
+    assert newest == ""
+    assert calls.count(1) == 1
+
+
+def test_failed_page_one_still_gets_the_fallback(monkeypatch):
+    newest, calls = run_walk(monkeypatch, [None, [{"id": "abc123", "type": "video"}]])
+    assert calls.count(1) == 2
+    assert newest
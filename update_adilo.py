@@ -10,9 +10,15 @@ We fetch the last 50 files by starting at a high offset and working
 backwards until we find videos, then pick the last one.
 """
 
+import concurrent.futures
 import os
 import sys
+from typing import Optional
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ---------------------------------------------------------------------------
 # CONFIG
@@ -27,99 +33,161 @@ ADILO_SECRET_KEY = env("ADILO_SECRET_KEY")
 ADILO_PROJECT_ID = env("ADILO_PROJECT_ID")
 ADILO_API_BASE   = "https://adilo-api.bigcommand.com/v1"
 ADILO_WATCH_BASE = "https://adilo.bigcommand.com/watch"
+ADILO_FILES_URL  = f"{ADILO_API_BASE}/projects/{ADILO_PROJECT_ID}/files"
 
 GH_PAT           = env("GH_PAT")
 GH_REPO          = env("GITHUB_REPOSITORY")
 GH_API_BASE      = "https://api.github.com"
 VARIABLE_NAME    = "ADILO_CURRENT_VIDEO_ID"
+GH_VARIABLES_URL = f"{GH_API_BASE}/repos/{GH_REPO}/actions/variables"
+GH_VARIABLE_URL  = f"{GH_VARIABLES_URL}/{VARIABLE_NAME}"
 
 # Start fetching from this offset. Set higher than your total video count
 # so we land near the end of the list where newest videos are.
 # Override with repo variable ADILO_FETCH_FROM if needed.
 FETCH_FROM       = int(env("ADILO_FETCH_FROM", "500"))
 PAGE_SIZE        = 50
+PROBE_BATCH      = 4   # pages requested concurrently per round
+# (connect, read) seconds: a dead host fails fast on connect instead of
+# holding a probe for the full read window.
+HTTP_TIMEOUT     = (5, 15)
+
+# One session for the whole run: page walks hit the same Adilo host over and
+# over, so keep-alive connections save a TLS handshake per request. Compression
+# is pinned on the session (br too, via brotli in requirements). Transient
+# 429/5xx on idempotent requests get a quick backed-off retry (never the
+# GitHub PATCH/POST).
+SESSION = requests.Session()
+SESSION.headers["Accept-Encoding"] = requests.utils.DEFAULT_ACCEPT_ENCODING
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=PROBE_BATCH,
+    pool_maxsize=PROBE_BATCH,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+))
 
 
 # ---------------------------------------------------------------------------
 # ADILO API
 # ---------------------------------------------------------------------------
 
-def adilo_headers() -> dict:
-    return {
-        "User-Agent": "IttyBittyGamingNews/AdiloUpdater",
-        "Accept": "application/json",
-        "X-Public-Key": ADILO_PUBLIC_KEY,
-        "X-Secret-Key": ADILO_SECRET_KEY,
-    }
+# Built once — the keys never change during a run. Passed per request rather
+# than set on SESSION so the Adilo keys are never sent to the GitHub API.
+ADILO_HEADERS = {
+    "User-Agent": "IttyBittyGamingNews/AdiloUpdater",
+    "Accept": "application/json",
+    "X-Public-Key": ADILO_PUBLIC_KEY,
+    "X-Secret-Key": ADILO_SECRET_KEY,
+}
+
+
+PAYLOAD_KEYS = ("payload", "data", "files")
+
+
+def body_snippet(r: requests.Response, max_len: int = 200) -> str:
+    """The first max_len bytes of a response body for a log line, without decoding the rest."""
+    head = r.content[:max_len]
+    try:
+        return head.decode(r.encoding or "utf-8", "replace")
+    except LookupError:  # unknown charset label
+        return head.decode("utf-8", "replace")
+
+
+def files_from_response(data) -> list:
+    """The file list from a files response: a bare list, or the first list under PAYLOAD_KEYS."""
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in PAYLOAD_KEYS:
+            if isinstance(files := data.get(key), list) and files:
+                return files
+    return []
 
 
-def fetch_page(from_idx: int, to_idx: int) -> list:
-    """Fetch a single page of files."""
-    url = f"{ADILO_API_BASE}/projects/{ADILO_PROJECT_ID}/files?From={from_idx}&To={to_idx}"
+def fetch_page(from_idx: int, to_idx: int) -> Optional[list]:
+    """Fetch a single page of files ([] = empty page, None = the request failed)."""
+    url = f"{ADILO_FILES_URL}?From={from_idx}&To={to_idx}"
     try:
-        r = requests.get(url, headers=adilo_headers(), timeout=30)
+        r = SESSION.get(url, headers=ADILO_HEADERS, timeout=HTTP_TIMEOUT)
         r.raise_for_status()
-        data = r.json()
-        payload = (
-            data.get("payload") or data.get("data") or
-            data.get("files") or (data if isinstance(data, list) else [])
-        )
-        return payload
+        # An HTML body (login/error page) can't be a file list — report it
+        # directly instead of via a JSON decode failure
+        content_type = r.headers.get("Content-Type", "")
+        if "html" in content_type:
+            print(f"[ADILO] Non-JSON response ({from_idx}-{to_idx}, {content_type}): {body_snippet(r)}")
+            return None
+        return files_from_response(orjson.loads(r.content))
     except Exception as ex:
         print(f"[ADILO] Request failed ({from_idx}-{to_idx}): {ex}")
-        return []
+        return None
 
 
 def find_newest_video() -> str:
     """
-    Walk backwards from FETCH_FROM in 50-file pages until we find
-    a non-empty page. The last item on the last non-empty page
-    is the newest video.
+    Find the last non-empty 50-file page around FETCH_FROM. The last
+    item on the last non-empty page is the newest video.
     """
     if not (ADILO_PUBLIC_KEY and ADILO_SECRET_KEY and ADILO_PROJECT_ID):
         print("[ADILO] Missing credentials.")
         return ""
 
-    # Try pages walking backwards from FETCH_FROM until we find files
-    # Start high, step down by PAGE_SIZE each time if page is empty
-    from_idx = FETCH_FROM
+    # The list is oldest-first, so the newest video is on the highest
+    # non-empty page. Pages are probed PROBE_BATCH at a time concurrently
+    # (forward from FETCH_FROM while pages come back full, or backward if
+    # FETCH_FROM is already past the end) and the batch is read in order.
     last_good_files = []
-    attempts = 0
-    max_attempts = 10  # safety limit
-
-    while attempts < max_attempts:
-        to_idx = from_idx + PAGE_SIZE - 1
-        print(f"[ADILO] Trying page {from_idx}–{to_idx}...")
-        files = fetch_page(from_idx, to_idx)
-
-        if files:
+    max_attempts = 10  # safety limit (pages per direction)
+    empty_pages = set()   # offsets that answered with no files (not failures)
+
+    def probe(offsets: list) -> list:
+        for o in offsets:
+            print(f"[ADILO] Trying page {o}–{o + PAGE_SIZE - 1}...")
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(offsets)) as executor:
+            pages = list(executor.map(lambda o: fetch_page(o, o + PAGE_SIZE - 1), offsets))
+        empty_pages.update(o for o, files in zip(offsets, pages) if files == [])
+        return pages
+
+    def batches(offsets: list) -> list:
+        # FETCH_FROM alone first: a partial/empty page there settles it in one
+        # request, so only fan out once a full page proves there is more.
+        return [offsets[:1]] + [offsets[i:i + PROBE_BATCH] for i in range(1, len(offsets), PROBE_BATCH)]
+
+    # Forward: stop at the first partial or empty page
+    offsets = [FETCH_FROM + k * PAGE_SIZE for k in range(max_attempts)]
+    done = False
+    for batch in batches(offsets):
+        for files in probe(batch):
+            if not files:
+                if last_good_files:
+                    print(f"[ADILO] Empty page after good data — using last good page.")
+                done = True
+                break
             print(f"[ADILO] Got {len(files)} file(s).")
             last_good_files = files
-
-            # If we got a full page, there might be more ahead — try next page
-            if len(files) == PAGE_SIZE:
-                from_idx += PAGE_SIZE
-                attempts += 1
-                continue
-            else:
-                # Partial page = this is the last page, stop here
+            if len(files) < PAGE_SIZE:
                 print(f"[ADILO] Partial page — this is the end of the list.")
+                done = True
                 break
-        else:
-            # Empty page — step back if we haven't found anything yet
-            if not last_good_files:
-                from_idx = max(1, from_idx - PAGE_SIZE)
-                print(f"[ADILO] Empty page — stepping back to {from_idx}.")
-                attempts += 1
-                continue
-            else:
-                # We already have a good page, empty means we went too far
-                print(f"[ADILO] Empty page after good data — using last good page.")
+        if done:
+            break
+
+    # Backward: FETCH_FROM was past the end — first non-empty page going down
+    if not last_good_files and FETCH_FROM > 1:
+        print(f"[ADILO] Empty page — stepping back from {FETCH_FROM}.")
+        offsets = sorted({max(1, FETCH_FROM - k * PAGE_SIZE) for k in range(1, max_attempts + 1)}, reverse=True)
+        for i in range(0, len(offsets), PROBE_BATCH):
+            last_good_files = next((f for f in probe(offsets[i:i + PROBE_BATCH]) if f), [])
+            if last_good_files:
+                print(f"[ADILO] Got {len(last_good_files)} file(s).")
                 break
 
-    if not last_good_files:
+    # The backward walk reaches page 1 whenever FETCH_FROM is within
+    # max_attempts pages of the start; if it came back empty there, don't
+    # request it a second time (a failed request still gets the retry).
+    if not last_good_files and 1 in empty_pages:
+        print("[ADILO] Could not find any files.")
+    elif not last_good_files:
         print("[ADILO] Could not find any files. Falling back to page 1.")
-        last_good_files = fetch_page(1, PAGE_SIZE)
+        last_good_files = fetch_page(1, PAGE_SIZE) or []
 
     if not last_good_files:
         return ""
@@ -133,13 +201,13 @@ def find_newest_video() -> str:
         print(f"  [{i:>2}] id={fid:<12}  type={ftype:<10}  name={name}")
     print(f"[ADILO] ----------------------------------\n")
 
-    # Newest = last item on the last page (oldest-first ordering confirmed)
-    video_files = [
-        f for f in last_good_files
-        if f.get("type", "").lower() not in ("folder", "image", "audio")
-    ] or last_good_files
-
-    candidate = video_files[-1]
+    # Newest = last video on the last page (oldest-first ordering confirmed);
+    # scan from the end and stop at the first hit instead of filtering it all
+    candidate = next(
+        (f for f in reversed(last_good_files)
+         if f.get("type", "").lower() not in ("folder", "image", "audio")),
+        last_good_files[-1],
+    )
     fid = (
         candidate.get("id") or candidate.get("uuid") or
         candidate.get("file_id") or candidate.get("fileId") or ""
@@ -156,12 +224,11 @@ def find_newest_video() -> str:
 # GITHUB API
 # ---------------------------------------------------------------------------
 
-def gh_headers() -> dict:
-    return {
-        "Authorization": f"Bearer {GH_PAT}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
+GH_HEADERS = {
+    "Authorization": f"Bearer {GH_PAT}",
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
 
 
 def get_current_variable() -> str:
@@ -169,9 +236,8 @@ def get_current_variable() -> str:
         print("[GH] GH_PAT or GITHUB_REPOSITORY not set.")
         return ""
 
-    url = f"{GH_API_BASE}/repos/{GH_REPO}/actions/variables/{VARIABLE_NAME}"
     try:
-        r = requests.get(url, headers=gh_headers(), timeout=15)
+        r = SESSION.get(GH_VARIABLE_URL, headers=GH_HEADERS, timeout=HTTP_TIMEOUT)
         if r.status_code == 404:
             print(f"[GH] {VARIABLE_NAME} does not exist yet — will create it.")
             return ""
@@ -189,20 +255,18 @@ def set_variable(value: str) -> bool:
         print("[GH] GH_PAT or GITHUB_REPOSITORY not set.")
         return False
 
-    url     = f"{GH_API_BASE}/repos/{GH_REPO}/actions/variables/{VARIABLE_NAME}"
     payload = {"name": VARIABLE_NAME, "value": value}
 
     try:
-        r = requests.patch(url, headers=gh_headers(), json=payload, timeout=15)
+        r = SESSION.patch(GH_VARIABLE_URL, headers=GH_HEADERS, json=payload, timeout=HTTP_TIMEOUT)
         if r.status_code == 404:
-            create_url = f"{GH_API_BASE}/repos/{GH_REPO}/actions/variables"
-            r = requests.post(create_url, headers=gh_headers(), json=payload, timeout=15)
+            r = SESSION.post(GH_VARIABLES_URL, headers=GH_HEADERS, json=payload, timeout=HTTP_TIMEOUT)
 
         if r.status_code in (200, 201, 204):
             print(f"[GH] {VARIABLE_NAME} set to: {value}")
             return True
 
-        print(f"[GH] Failed. Status={r.status_code}  Body={r.text[:300]}")
+        print(f"[GH] Failed. Status={r.status_code}  Body={body_snippet(r, 300)}")
         return False
     except Exception as ex:
         print(f"[GH] Exception: {ex}")
@@ -220,7 +284,12 @@ def main() -> None:
     print(f"  Starting search from position {FETCH_FROM}")
     print("=" * 50)
 
-    newest_id = find_newest_video()
+    # The GitHub variable read doesn't depend on the Adilo walk, so run it
+    # alongside instead of paying for its round-trip afterwards.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        current_future = executor.submit(get_current_variable)
+        newest_id      = find_newest_video()
+        current_id     = current_future.result()
 
     if not newest_id:
         print("[UPDATER] Could not determine newest video ID.")
@@ -228,8 +297,6 @@ def main() -> None:
 
     print(f"[UPDATER] Newest video URL: {ADILO_WATCH_BASE}/{newest_id}")
 
-    current_id = get_current_variable()
-
     if current_id == newest_id:
         print(f"[UPDATER] Already up to date — no change needed.")
         sys.exit(0)